@@ -1,12 +1,21 @@
+import argparse
 import json
 import logging
 import os
 import re
+import sys
+from contextlib import closing
 from datetime import datetime
 
+import numpy as np
+import orjson
 import pandas as pd
 from playwright.sync_api import sync_playwright
 
+# The CSV and Excel writers are shared with the pipeline so both produce the same files
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.bmw.data_processor import prepare_excel_export, save_excel, save_history_csv  # noqa: E402
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +30,9 @@ TRACKING_COLUMNS = [
     'horse_power_kw', 'horse_power_ps', 'battery_range_km', 'equipments'
 ]
 
+# Tracking columns compared as numbers
+NUMERIC_TRACKING_COLUMNS = ['price', 'kilometers', 'horse_power_kw', 'horse_power_ps', 'battery_range_km']
+
 HISTORY_COLUMNS = [
     'car_id', 'model_name', 'price', 'kilometers', 'registration_date',
     'horse_power_kw', 'horse_power_ps', 'battery_range_km', 'equipments',
@@ -39,6 +51,177 @@ SCORES_COLUMNS = [
     'is_latest', 'scrape_date'
 ]
 
+SCORE_VALUE_COLUMNS = [
+    'value_efficiency_score', 'age_usage_score', 'performance_range_score',
+    'equipment_score', 'final_score'
+]
+
+# Adequacy step functions: below the first threshold scores 20, at or above the last scores 100
+RANGE_ADEQUACY_THRESHOLDS = np.array([300, 350, 400, 450, 500])
+POWER_ADEQUACY_THRESHOLDS = np.array([100, 150, 200, 250, 300])
+ADEQUACY_SCORES = np.array([20, 40, 60, 80, 90, 100], dtype='float64')
+
+# Performance/range score: 40% range adequacy, 30% power adequacy, 30% range efficiency
+PERFORMANCE_RANGE_WEIGHTS = np.array([0.4, 0.3, 0.3])
+
+# Age/usage score: 40% age, 40% usage, 20% newness
+AGE_USAGE_WEIGHTS = np.array([0.4, 0.4, 0.2])
+
+# Compiled once at import and shared by the parse_* helpers
+_WS_RE = re.compile(r'\s+')
+_NONNUM = re.compile(r'[^\d\.\-]')
+_DIGITS_GROUP = re.compile(r'(\d+)')
+_KW_RE = re.compile(r'(\d+)\s*kW')
+_PS_RE = re.compile(r'\((\d+)\s*PS\)')
+# Month word and year of strings like 'août 2025'; trailing words are ignored
+_REG_DATE_RE = re.compile(r'^\s*(\S+)\s+([+-]?\d+)(?!\S)')
+
+# French month names mapping
+FRENCH_MONTHS = {
+    'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
+    'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
+    'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12
+}
+
+# Requests none of the selectors need. Stylesheets stay: the extracted innerText depends on
+# CSS (text-transform, hidden nodes), so dropping it would change values against the history
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_URL_PARTS = (
+    'googletagmanager', 'adobedtm', 'google-analytics', 'doubleclick.net',
+    'facebook.net', 'hotjar', 'bing.com/bat'
+)
+
+# Headless browser settings, as in the pipeline scraper; the default headless user agent
+# announces HeadlessChrome, so a desktop one is set
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process'
+]
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+HIDE_WEBDRIVER_JS = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+# Detail pages loading at the same time, each in its own tab
+DETAIL_TABS = 4
+
+# Results page selectors
+MODEL_CARD_SEL = 'a.model-card-link'
+SHOW_MORE_SEL = '[data-test="stolo-plp-show-more-button"]'
+CARD_LINKS_JS = """
+    els => els.map(e => e.getAttribute('href'))
+        .filter(Boolean)
+        .map(href => href.startsWith('/') ? `https://www.bmw.be${href}` : href)
+"""
+
+# Detail page selectors, passed to EXTRACT_CAR_JS
+KEY_FACTS_SEL = '#stock-locator__key-facts-section'
+CAR_SELECTORS = {
+    'model_name': 'h1#stock-locator__details-heading-1',
+    'car_id': 'div.vehicle-intro__vin',
+    'price': 'div.subtitle-0.price strong',
+    'key_facts': KEY_FACTS_SEL,
+    'key_fact_value': 'div.value-disclaimer div.value.caption',
+    'key_fact_value_fallback': 'div.value.caption',
+    'range_label': 'div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]',
+    'range_table': 'div[class*="technical-data_table"]',
+    'range_value': 'div.headline-5 span',
+    'range_sibling': 'div[class*="headline-5"]',
+    'equipment_section': 'section.equipment-section-container',
+    'equipment_panel': 'neo-accordion-panel',
+    'equipment_header': '.content-header',
+    'equipment_category': '.header-label',
+    'equipment_card': 'div.details-card',
+    'equipment_name': 'div.headline-7.tw-mb-ng-300',
+}
+
+# Detail page sections awaited before reading the fields; equipment panels may be collapsed,
+# so they only need to be attached
+DETAIL_SECTION_WAITS = (
+    (CAR_SELECTORS['range_label'], 'visible'),
+    (f"{CAR_SELECTORS['equipment_section']} {CAR_SELECTORS['equipment_panel']}", 'attached'),
+)
+
+# Titles of the key facts read from the detail page, by field
+KEY_FACT_TITLES = {
+    'kilometers': 'Kilomètres',
+    'registration_date': "Date d'immatriculation",
+    'horse_power': 'Power Based on Degree of Electrification',
+}
+
+# Reads every detail-page field in one evaluate call. Queries also search open shadow roots,
+# like Playwright's CSS locators do; missing fields come back as empty strings.
+EXTRACT_CAR_JS = """
+([sel, keyFactTitles]) => {
+    const queryAll = (root, selector) => {
+        const found = [...root.querySelectorAll(selector)];
+        const hosts = [...root.querySelectorAll('*')];
+        if (root.shadowRoot) hosts.push(root);
+        for (const host of hosts) {
+            if (host.shadowRoot) found.push(...queryAll(host.shadowRoot, selector));
+        }
+        return found;
+    };
+    const query = (root, selector) => (root ? queryAll(root, selector)[0] || null : null);
+    const text = (el) => (el && el.innerText ? el.innerText.trim() : '');
+
+    const keyFacts = query(document, sel.key_facts);
+    const keyFact = (title) => {
+        const fact = query(keyFacts, `div.key-fact[title="${title}"]`);
+        return text(query(fact, sel.key_fact_value)) || text(query(fact, sel.key_fact_value_fallback));
+    };
+
+    const rangeLabel = query(document, sel.range_label);
+    let batteryRange = text(query(rangeLabel && rangeLabel.closest(sel.range_table), sel.range_value));
+    for (let sibling = rangeLabel && rangeLabel.nextElementSibling; !batteryRange && sibling; sibling = sibling.nextElementSibling) {
+        if (sibling.matches(sel.range_sibling)) batteryRange = text(query(sibling, 'span'));
+    }
+
+    const equipmentPanels = [];
+    for (const section of queryAll(document, sel.equipment_section)) {
+        for (const panel of queryAll(section, sel.equipment_panel)) {
+            const category = text(query(query(panel, sel.equipment_header), sel.equipment_category));
+            const items = queryAll(panel, sel.equipment_card)
+                .map((card) => text(query(card, sel.equipment_name)))
+                .filter(Boolean);
+            equipmentPanels.push([category, items]);
+        }
+    }
+
+    const fields = {
+        model_name: text(query(document, sel.model_name)),
+        car_id: text(query(document, sel.car_id)),
+        price: text(query(document, sel.price)),
+        battery_range: batteryRange,
+        equipment_panels: equipmentPanels,
+    };
+    for (const [field, title] of Object.entries(keyFactTitles)) fields[field] = keyFact(title);
+    return fields;
+}
+"""
+
+
+def dump_equipment(equipment_data):
+    """Equipment as indented JSON text, the exact text json.dumps(ensure_ascii=False, indent=2) writes"""
+    # orjson writes the same bytes about ten times faster
+    return orjson.dumps(equipment_data, option=orjson.OPT_INDENT_2).decode()
+
+
+def route_request(route):
+    """Abort image, font and analytics requests none of the selectors need, let everything else through"""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS):
+        route.abort()
+    else:
+        route.continue_()
+
 
 def load_historical_data(history_file):
     """Load historical car data from CSV"""
@@ -67,7 +250,7 @@ def get_latest_records(history_df):
 def compare_records(old_record, new_record, tracking_cols):
     """Check if any tracked columns have changed"""
     for col in tracking_cols:
-        if col in ['price', 'kilometers', 'horse_power_kw', 'horse_power_ps', 'battery_range_km']:
+        if col in NUMERIC_TRACKING_COLUMNS:
             # Handle numeric comparisons with NaN
             old_val = old_record[col] if pd.notna(old_record[col]) else None
             new_val = new_record[col] if pd.notna(new_record[col]) else None
@@ -93,6 +276,12 @@ def merge_historical_data(current_data, history_df, scrape_date):
     if not latest_df.empty:
         latest_df['car_id'] = latest_df['car_id'].astype('Int64')
 
+    # Index latest records by car_id once so per-row lookups are hash hits, not column scans
+    latest_by_id = pd.DataFrame(columns=HISTORY_COLUMNS)
+    if not latest_df.empty:
+        latest_by_id = latest_df[latest_df['car_id'].notna()].drop_duplicates(subset=['car_id'])
+        latest_by_id = latest_by_id.set_index('car_id', drop=False)
+
     new_records = []
     processed_ids = set()
 
@@ -106,9 +295,9 @@ def merge_historical_data(current_data, history_df, scrape_date):
         processed_ids.add(car_id)
 
         # Check if car exists in latest history
-        old_record = latest_df[latest_df['car_id'] == car_id]
+        old_record = latest_by_id.loc[car_id] if pd.notna(car_id) and car_id in latest_by_id.index else None
 
-        if old_record.empty:
+        if old_record is None:
             # New car
             logger.info(f"[NEW] Car ID {car_id}: {row['model_name']}")
             new_row = row.to_dict()
@@ -123,18 +312,13 @@ def merge_historical_data(current_data, history_df, scrape_date):
             })
             new_records.append(new_row)
         else:
-            old_record = old_record.iloc[0]
-
             # Check if values changed
             if compare_records(old_record, row, TRACKING_COLUMNS):
                 # Values changed - end old record
                 logger.info(f"[CHANGED] Car ID {car_id}: {row['model_name']}")
 
                 # Mark old record as not latest
-                old_row = history_df[
-                    (history_df['car_id'] == car_id) &
-                    (history_df['is_latest'] == True)
-                ].iloc[0].to_dict()
+                old_row = old_record.to_dict()
                 old_row['valid_to'] = today_str
                 old_row['is_latest'] = False
                 new_records.append(old_row)
@@ -247,7 +431,7 @@ def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
     today_str = today.isoformat()
 
     # Get latest car records (to extract current equipment)
-    latest_cars = get_latest_records(car_history_df)
+    latest_cars = get_latest_records(car_history_df).dropna(subset=['car_id'])
 
     # Extract equipment from latest car records
     new_equipment_records = []
@@ -256,18 +440,13 @@ def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
     logger.info("PROCESSING EQUIPMENT DATA...")
     logger.info("=" * 60)
 
-    for idx, car_row in latest_cars.iterrows():
-        try:
-            car_id = car_row['car_id']
-            if pd.isna(car_id):
-                continue
-
-            equipments_json = car_row.get('equipments')
-            valid_from = car_row.get('valid_from')
-            valid_to = car_row.get('valid_to')
-            is_latest = car_row.get('is_latest', True)
-            scrape_date_str = car_row.get('scrape_date')
+    # Pull the needed columns out as arrays once; iterrows() would build a Series per row
+    equipment_cols = ['car_id', 'equipments', 'valid_from', 'valid_to', 'is_latest', 'scrape_date']
+    rows = latest_cars.reindex(columns=equipment_cols)
+    arrays = [rows[col].to_numpy(dtype=object) for col in equipment_cols]
 
+    for idx, (car_id, equipments_json, valid_from, valid_to, is_latest, scrape_date_str) in enumerate(zip(*arrays)):
+        try:
             # Convert dates to string if needed
             if pd.notna(valid_from):
                 valid_from = valid_from.isoformat() if hasattr(valid_from, 'isoformat') else str(valid_from)
@@ -305,127 +484,47 @@ def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
 
     if not equipment_history_df.empty:
         current_equipment = equipment_history_df[equipment_history_df['is_latest'] == True].copy()
-        merged_equipment_records = []
 
         # Keep old non-latest records
         old_equipment = equipment_history_df[equipment_history_df['is_latest'] == False].copy()
-        if not old_equipment.empty and isinstance(old_equipment, pd.DataFrame):
-            merged_equipment_records.append(old_equipment)
 
-        existing_car_ids = set(current_equipment['car_id'].unique()) if not current_equipment.empty else set()
+        # Only cars present in the new extraction are carried forward
+        current_equipment = current_equipment[current_equipment['car_id'].isin(car_ids)]
 
-        for car_id in car_ids:
-            try:
-                if pd.isna(car_id):
-                    continue
+        # Diff equipment sets for all cars in one hashed join on (car_id, category, equipment_name)
+        key = ['car_id', 'category', 'equipment_name']
 
-                car_new_equipment = new_equipment_df[new_equipment_df['car_id'] == car_id]
-                car_old_equipment = current_equipment[current_equipment['car_id'] == car_id] if car_id in existing_car_ids else pd.DataFrame()
+        def equipment_keys(df):
+            keys = df[key].dropna()
+            return keys.astype({'car_id': 'Int64', 'category': str, 'equipment_name': str}).drop_duplicates()
 
-                if car_old_equipment.empty:
-                    # New car - add all equipment
-                    if not car_new_equipment.empty and isinstance(car_new_equipment, pd.DataFrame):
-                        merged_equipment_records.append(car_new_equipment)
-                else:
-                    # Create sets for comparison
-                    new_set = set()
-                    for _, row in car_new_equipment.iterrows():
-                        try:
-                            category = row.get('category')
-                            equipment_name = row.get('equipment_name')
-                            if pd.notna(category) and pd.notna(equipment_name):
-                                new_set.add((str(category), str(equipment_name)))
-                        except Exception as e:
-                            logger.warning(f"      Error processing new equipment row for car {car_id}: {e}")
-                            continue
-
-                    old_set = set()
-                    for _, row in car_old_equipment.iterrows():
-                        try:
-                            category = row.get('category')
-                            equipment_name = row.get('equipment_name')
-                            if pd.notna(category) and pd.notna(equipment_name):
-                                old_set.add((str(category), str(equipment_name)))
-                        except Exception as e:
-                            logger.warning(f"      Error processing old equipment row for car {car_id}: {e}")
-                            continue
-
-                    # Mark old equipment as not latest if car equipment changed
-                    if new_set != old_set:
-                        # End old equipment records
-                        old_records_list = []
-                        for _, old_row in car_old_equipment.iterrows():
-                            try:
-                                old_record = old_row.to_dict()
-                                old_record['valid_to'] = today_str
-                                old_record['is_latest'] = False
-                                old_records_list.append(old_record)
-                            except Exception as e:
-                                logger.warning(f"      Error converting old equipment record for car {car_id}: {e}")
-                                continue
-
-                        # Convert list of dicts to DataFrame before appending
-                        if old_records_list:
-                            try:
-                                old_records_df = pd.DataFrame(old_records_list)
-                                if not old_records_df.empty:
-                                    merged_equipment_records.append(old_records_df)
-                            except Exception as e:
-                                logger.warning(f"      Error creating DataFrame for old equipment records (car {car_id}): {e}")
-
-                        # Add new equipment records
-                        if not car_new_equipment.empty and isinstance(car_new_equipment, pd.DataFrame):
-                            merged_equipment_records.append(car_new_equipment)
-                    else:
-                        # No change - just update scrape_date
-                        updated_records_list = []
-                        for _, old_row in car_old_equipment.iterrows():
-                            try:
-                                old_record = old_row.to_dict()
-                                old_record['scrape_date'] = today_str
-                                updated_records_list.append(old_record)
-                            except Exception as e:
-                                logger.warning(f"      Error converting updated equipment record for car {car_id}: {e}")
-                                continue
-
-                        # Convert list of dicts to DataFrame before appending
-                        if updated_records_list:
-                            try:
-                                updated_records_df = pd.DataFrame(updated_records_list)
-                                if not updated_records_df.empty:
-                                    merged_equipment_records.append(updated_records_df)
-                            except Exception as e:
-                                logger.warning(f"      Error creating DataFrame for updated equipment records (car {car_id}): {e}")
-            except Exception as e:
-                logger.warning(f"      Error processing equipment for car {car_id}: {e}")
-                continue
+        cmp = equipment_keys(current_equipment).merge(
+            equipment_keys(new_equipment_df), on=key, how='outer', indicator=True
+        )
+        cars_changed = cmp.loc[cmp['_merge'] != 'both', 'car_id'].unique()
 
-        # Combine all records - ensure all items are DataFrames
-        if merged_equipment_records:
-            # Filter out empty DataFrames and ensure all are DataFrames
-            valid_records = []
-            for df in merged_equipment_records:
-                if isinstance(df, pd.DataFrame) and not df.empty:
-                    # Ensure all required columns exist
-                    missing_cols = set(EQUIPMENT_COLUMNS) - set(df.columns)
-                    if missing_cols:
-                        logger.warning(f"      Missing columns in equipment DataFrame: {missing_cols}")
-                        # Add missing columns with None values
-                        for col in missing_cols:
-                            df[col] = None
-                    valid_records.append(df)
-
-            if valid_records:
-                try:
-                    merged_equipment = pd.concat(valid_records, ignore_index=True)
-                except Exception as e:
-                    logger.error(f"      Error concatenating equipment records: {e}")
-                    logger.warning(f"      Falling back to new equipment DataFrame only")
-                    merged_equipment = new_equipment_df
-            else:
-                merged_equipment = new_equipment_df
-        else:
-            merged_equipment = new_equipment_df
+        changed_mask = current_equipment['car_id'].isin(cars_changed)
+
+        # End old equipment records of cars whose equipment changed
+        ended_equipment = current_equipment[changed_mask].copy()
+        ended_equipment['valid_to'] = today_str
+        ended_equipment['is_latest'] = False
+
+        # No change - just update scrape_date
+        carried_equipment = current_equipment[~changed_mask].copy()
+        carried_equipment['scrape_date'] = today_str
+
+        # Add new equipment records for new cars and cars whose equipment changed
+        added_mask = ~new_equipment_df['car_id'].isin(current_equipment['car_id']) | new_equipment_df['car_id'].isin(cars_changed)
+        added_equipment = new_equipment_df[added_mask]
+
+        # Combine all records with a single concat
+        parts = [
+            part.reindex(columns=EQUIPMENT_COLUMNS)
+            for part in (old_equipment, ended_equipment, carried_equipment, added_equipment)
+            if not part.empty
+        ]
+        merged_equipment = pd.concat(parts, ignore_index=True) if parts else new_equipment_df
     else:
         # First time - no history
         merged_equipment = new_equipment_df
@@ -454,76 +553,36 @@ def load_scores_history(scores_file):
     return pd.DataFrame(columns=SCORES_COLUMNS)
 
 
+def _isoformat_dates(values, default):
+    """ISO-format date-like values (str() for anything else), default where missing"""
+    formatted = values.map(lambda v: v.isoformat() if hasattr(v, 'isoformat') else str(v))
+    return formatted.astype(object).where(values.notna(), default)
+
+
 def merge_scores_history(car_history_df, scores_history_df, scrape_date):
     """Merge scores data from car history with scores history"""
     today = scrape_date.date()
     today_str = today.isoformat()
 
     # Get latest car records (to extract current scores)
-    latest_cars = get_latest_records(car_history_df)
-
-    # Extract scores from latest car records
-    new_scores_records = []
+    latest_cars = get_latest_records(car_history_df).dropna(subset=['car_id'])
 
     logger.info("=" * 60)
     logger.info("PROCESSING SCORES DATA...")
     logger.info("=" * 60)
 
-    for idx, car_row in latest_cars.iterrows():
-        try:
-            car_id = car_row['car_id']
-            if pd.isna(car_id):
-                continue
-
-            # Extract score columns
-            value_efficiency_score = car_row.get('value_efficiency_score')
-            age_usage_score = car_row.get('age_usage_score')
-            performance_range_score = car_row.get('performance_range_score')
-            equipment_score = car_row.get('equipment_score')
-            final_score = car_row.get('final_score')
-            valid_from = car_row.get('valid_from')
-            valid_to = car_row.get('valid_to')
-            is_latest = car_row.get('is_latest', True)
-            scrape_date_str = car_row.get('scrape_date')
+    # Only cars with at least one score get a record; one mask instead of a check per row
+    rows = latest_cars.reindex(columns=SCORES_COLUMNS)
+    rows = rows[rows[SCORE_VALUE_COLUMNS].notna().any(axis=1)]
+    # Scores are stored as float64, as the history file always has, whatever dtype the scorer used
+    rows = rows.astype({col: 'float64' for col in SCORE_VALUE_COLUMNS})
 
-            # Convert dates to string if needed
-            if pd.notna(valid_from):
-                valid_from = valid_from.isoformat() if hasattr(valid_from, 'isoformat') else str(valid_from)
-            else:
-                valid_from = today_str
-
-            if pd.notna(valid_to):
-                valid_to = valid_to.isoformat() if hasattr(valid_to, 'isoformat') else str(valid_to)
-            else:
-                valid_to = None
-
-            if pd.notna(scrape_date_str):
-                scrape_date_str = scrape_date_str.isoformat() if hasattr(scrape_date_str, 'isoformat') else str(scrape_date_str)
-            else:
-                scrape_date_str = today_str
-
-            # Only add record if at least one score exists
-            if pd.notna(value_efficiency_score) or pd.notna(age_usage_score) or \
-               pd.notna(performance_range_score) or pd.notna(equipment_score) or pd.notna(final_score):
-                score_record = {
-                    'car_id': car_id,
-                    'value_efficiency_score': value_efficiency_score if pd.notna(value_efficiency_score) else None,
-                    'age_usage_score': age_usage_score if pd.notna(age_usage_score) else None,
-                    'performance_range_score': performance_range_score if pd.notna(performance_range_score) else None,
-                    'equipment_score': equipment_score if pd.notna(equipment_score) else None,
-                    'final_score': final_score if pd.notna(final_score) else None,
-                    'valid_from': valid_from,
-                    'valid_to': valid_to,
-                    'is_latest': is_latest,
-                    'scrape_date': scrape_date_str
-                }
-                new_scores_records.append(score_record)
-        except Exception as e:
-            logger.warning(f"      Error processing scores for car row {idx}: {e}")
-            continue
-
-    # Create new scores dataframe
-    new_scores_df = pd.DataFrame(new_scores_records)
+    # Convert dates to string if needed
+    new_scores_df = rows.assign(
+        valid_from=_isoformat_dates(rows['valid_from'], today_str),
+        valid_to=_isoformat_dates(rows['valid_to'], None),
+        scrape_date=_isoformat_dates(rows['scrape_date'], today_str)
+    ).reset_index(drop=True)
 
     if new_scores_df.empty:
         logger.info("      No scores records to process")
@@ -534,130 +593,58 @@ def merge_scores_history(car_history_df, scores_history_df, scrape_date):
 
     if not scores_history_df.empty:
         current_scores = scores_history_df[scores_history_df['is_latest'] == True].copy()
-        merged_scores_records = []
+        # Plain dict rows, turned into DataFrames once after the loop
+        ended_rows = []
+        carried_rows = []
+        added_car_ids = []
 
         # Keep old non-latest records
         old_scores = scores_history_df[scores_history_df['is_latest'] == False].copy()
-        if not old_scores.empty and isinstance(old_scores, pd.DataFrame):
-            merged_scores_records.append(old_scores)
 
-        existing_car_ids = set(current_scores['car_id'].unique()) if not current_scores.empty else set()
+        # Group both sides by car once so each car's rows are a dict lookup, not a column scan
+        old_groups = {k: v for k, v in current_scores.groupby('car_id', sort=False)}
+        new_groups = {k: v for k, v in new_scores_df.groupby('car_id', sort=False)}
 
         for car_id in car_ids:
             try:
-                if pd.isna(car_id):
-                    continue
-
-                car_new_scores = new_scores_df[new_scores_df['car_id'] == car_id]
-                car_old_scores = current_scores[current_scores['car_id'] == car_id] if car_id in existing_car_ids else pd.DataFrame()
+                car_new_scores = new_groups[car_id]
+                car_old_scores = old_groups.get(car_id)
 
-                if car_old_scores.empty:
+                if car_old_scores is None:
                     # New car - add all scores
-                    if not car_new_scores.empty and isinstance(car_new_scores, pd.DataFrame):
-                        merged_scores_records.append(car_new_scores)
+                    added_car_ids.append(car_id)
                 else:
-                    # Compare scores to see if they changed
-                    # Create comparison dicts (round to 2 decimals for comparison)
-                    new_scores_dict = {}
-                    if not car_new_scores.empty:
-                        row = car_new_scores.iloc[0]
-                        new_scores_dict = {
-                            'value_efficiency_score': round(row.get('value_efficiency_score', 0), 2) if pd.notna(row.get('value_efficiency_score')) else None,
-                            'age_usage_score': round(row.get('age_usage_score', 0), 2) if pd.notna(row.get('age_usage_score')) else None,
-                            'performance_range_score': round(row.get('performance_range_score', 0), 2) if pd.notna(row.get('performance_range_score')) else None,
-                            'equipment_score': round(row.get('equipment_score', 0), 2) if pd.notna(row.get('equipment_score')) else None,
-                            'final_score': round(row.get('final_score', 0), 2) if pd.notna(row.get('final_score')) else None
-                        }
-
-                    old_scores_dict = {}
-                    if not car_old_scores.empty:
-                        row = car_old_scores.iloc[0]
-                        old_scores_dict = {
-                            'value_efficiency_score': round(row.get('value_efficiency_score', 0), 2) if pd.notna(row.get('value_efficiency_score')) else None,
-                            'age_usage_score': round(row.get('age_usage_score', 0), 2) if pd.notna(row.get('age_usage_score')) else None,
-                            'performance_range_score': round(row.get('performance_range_score', 0), 2) if pd.notna(row.get('performance_range_score')) else None,
-                            'equipment_score': round(row.get('equipment_score', 0), 2) if pd.notna(row.get('equipment_score')) else None,
-                            'final_score': round(row.get('final_score', 0), 2) if pd.notna(row.get('final_score')) else None
-                        }
-
-                    # Check if scores changed
-                    scores_changed = new_scores_dict != old_scores_dict
+                    # Compare scores to see if they changed (rounded to 2 decimals, NaN == NaN)
+                    new_arr = car_new_scores[SCORE_VALUE_COLUMNS].to_numpy(dtype='float64')[0].round(2)
+                    old_arr = car_old_scores[SCORE_VALUE_COLUMNS].to_numpy(dtype='float64')[0].round(2)
+                    scores_changed = not np.array_equal(new_arr, old_arr, equal_nan=True)
 
                     if scores_changed:
                         # End old scores record
-                        old_records_list = []
-                        for _, old_row in car_old_scores.iterrows():
-                            try:
-                                old_record = old_row.to_dict()
-                                old_record['valid_to'] = today_str
-                                old_record['is_latest'] = False
-                                old_records_list.append(old_record)
-                            except Exception as e:
-                                logger.warning(f"      Error converting old scores record for car {car_id}: {e}")
-                                continue
-
-                        # Convert list of dicts to DataFrame before appending
-                        if old_records_list:
-                            try:
-                                old_records_df = pd.DataFrame(old_records_list)
-                                if not old_records_df.empty:
-                                    merged_scores_records.append(old_records_df)
-                            except Exception as e:
-                                logger.warning(f"      Error creating DataFrame for old scores records (car {car_id}): {e}")
+                        for old_record in car_old_scores.to_dict('records'):
+                            old_record['valid_to'] = today_str
+                            old_record['is_latest'] = False
+                            ended_rows.append(old_record)
 
                         # Add new scores records
-                        if not car_new_scores.empty and isinstance(car_new_scores, pd.DataFrame):
-                            merged_scores_records.append(car_new_scores)
+                        added_car_ids.append(car_id)
                     else:
                         # No change - just update scrape_date
-                        updated_records_list = []
-                        for _, old_row in car_old_scores.iterrows():
-                            try:
-                                old_record = old_row.to_dict()
-                                old_record['scrape_date'] = today_str
-                                updated_records_list.append(old_record)
-                            except Exception as e:
-                                logger.warning(f"      Error converting updated scores record for car {car_id}: {e}")
-                                continue
-
-                        # Convert list of dicts to DataFrame before appending
-                        if updated_records_list:
-                            try:
-                                updated_records_df = pd.DataFrame(updated_records_list)
-                                if not updated_records_df.empty:
-                                    merged_scores_records.append(updated_records_df)
-                            except Exception as e:
-                                logger.warning(f"      Error creating DataFrame for updated scores records (car {car_id}): {e}")
+                        for old_record in car_old_scores.to_dict('records'):
+                            old_record['scrape_date'] = today_str
+                            carried_rows.append(old_record)
             except Exception as e:
                 logger.warning(f"      Error processing scores for car {car_id}: {e}")
                 continue
 
-        # Combine all records - ensure all items are DataFrames
-        if merged_scores_records:
-            # Filter out empty DataFrames and ensure all are DataFrames
-            valid_records = []
-            for df in merged_scores_records:
-                if isinstance(df, pd.DataFrame) and not df.empty:
-                    # Ensure all required columns exist
-                    missing_cols = set(SCORES_COLUMNS) - set(df.columns)
-                    if missing_cols:
-                        logger.warning(f"      Missing columns in scores DataFrame: {missing_cols}")
-                        # Add missing columns with None values
-                        for col in missing_cols:
-                            df[col] = None
-                    valid_records.append(df)
-
-            if valid_records:
-                try:
-                    merged_scores = pd.concat(valid_records, ignore_index=True)
-                except Exception as e:
-                    logger.error(f"      Error concatenating scores records: {e}")
-                    logger.warning(f"      Falling back to new scores DataFrame only")
-                    merged_scores = new_scores_df
-            else:
-                merged_scores = new_scores_df
-        else:
-            merged_scores = new_scores_df
+        # Combine all records with a single concat
+        added_scores = new_scores_df[new_scores_df['car_id'].isin(added_car_ids)]
+        parts = [
+            part.reindex(columns=SCORES_COLUMNS)
+            for part in (old_scores, pd.DataFrame(ended_rows), pd.DataFrame(carried_rows), added_scores)
+            if not part.empty
+        ]
+        merged_scores = pd.concat(parts, ignore_index=True) if parts else new_scores_df
     else:
         # First time - no history
         merged_scores = new_scores_df
@@ -736,36 +723,23 @@ url="https://www.bmw.be/fr-be/sl/stocklocator_uc/results?filters=%257B%2522MARKE
 # all BMW i4
 #url = "https://www.bmw.be/fr-be/sl/stocklocator_uc/results?filters=%257B%2522MARKETING_MODEL_RANGE%2522%253A%255B%2522i4_G26E%2522%255D%257D"
 
-def parse_price(price_str):
-    """Convert price string like '59 950,00 €' to float like 59950.0"""
-    if not price_str:
-        return None
-    try:
-        # Remove currency symbol and all whitespace (including non-breaking spaces)
-        cleaned = price_str.replace('€', '').strip()
-        # Remove all whitespace characters (spaces, non-breaking spaces, etc.)
-        cleaned = re.sub(r'\s+', '', cleaned)
-        # Replace comma with dot for decimal separator
-        cleaned = cleaned.replace(',', '.')
-        # Remove any remaining non-numeric characters except dot and minus
-        cleaned = re.sub(r'[^\d\.\-]', '', cleaned)
-        return float(cleaned)
-    except Exception as e:
-        return None
+def parse_price_series(price_series):
+    """Convert price strings like '59 950,00 €' to floats like 59950.0"""
+    # Remove currency symbol and all whitespace, turn the decimal comma into a dot, drop anything else non-numeric
+    cleaned = price_series.astype('string').str.replace('€', '', regex=False).str.replace(_WS_RE, '', regex=True)
+    cleaned = cleaned.str.replace(',', '.', regex=False).str.replace(_NONNUM, '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').astype('Float64')
 
 
-def parse_kilometers(km_str):
-    """Convert kilometers string like '9500 km' to integer like 9500"""
-    if not km_str:
-        return None
-    # Extract numbers only
-    numbers = re.findall(r'\d+', km_str.replace(' ', ''))
-    if numbers:
-        try:
-            return int(numbers[0])
-        except:
-            return None
-    return None
+def _first_number_series(text_series):
+    """First integer of each string with whitespace removed, <NA> where there is none"""
+    compact = text_series.astype('string').str.replace(_WS_RE, '', regex=True)
+    return compact.str.extract(_DIGITS_GROUP, expand=False).astype('Int64')
+
+
+def parse_kilometers_series(km_series):
+    """Convert kilometers strings like '9500 km' to integers like 9500"""
+    return _first_number_series(km_series)
 
 
 def parse_car_id(car_id_str):
@@ -778,59 +752,53 @@ def parse_car_id(car_id_str):
         return None
 
 
-def parse_horse_power(power_str):
-    """Extract kW and PS from power string like '210 kW (286 PS)'"""
-    if not power_str:
-        return None, None
-    # Extract kW value
-    kw_match = re.search(r'(\d+)\s*kW', power_str)
-    kw = int(kw_match.group(1)) if kw_match else None
-    # Extract PS value
-    ps_match = re.search(r'\((\d+)\s*PS\)', power_str)
-    ps = int(ps_match.group(1)) if ps_match else None
+def parse_horse_power_series(power_series):
+    """Extract kW and PS from power strings like '210 kW (286 PS)', returns (kW, PS) Series"""
+    power_series = power_series.astype('string')
+    kw = power_series.str.extract(_KW_RE, expand=False).astype('Int64')
+    ps = power_series.str.extract(_PS_RE, expand=False).astype('Int64')
     return kw, ps
 
 
-def parse_battery_range(range_str):
-    """Extract battery range from string like '475 km' to integer like 475"""
-    if not range_str:
-        return None
-    # Extract numbers only
-    numbers = re.findall(r'\d+', range_str.replace(' ', ''))
-    if numbers:
-        try:
-            return int(numbers[0])
-        except:
-            return None
-    return None
+def parse_battery_range_series(range_series):
+    """Extract battery range from strings like '475 km' to integers like 475"""
+    return _first_number_series(range_series)
 
 
-def parse_registration_date(date_str):
-    """Convert French date string like 'août 2025' to datetime object"""
-    if not date_str:
-        return None
+def parse_registration_series(date_series):
+    """Convert French date strings like 'août 2025' to datetimes (first day of the month), NaT where unparseable"""
+    parts = date_series.astype('string').str.lower().str.extract(_REG_DATE_RE)
+    months = parts[0].map(FRENCH_MONTHS).astype('float64')
+    years = pd.to_numeric(parts[1], errors='coerce').astype('float64')
+    return pd.to_datetime(pd.DataFrame({'year': years, 'month': months, 'day': 1}), errors='coerce')
 
-    # French month names mapping
-    french_months = {
-        'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
-        'mai': 5, 'juin': 6, 'juillet': 7, 'août': 8,
-        'septembre': 9, 'octobre': 10, 'novembre': 11, 'décembre': 12
-    }
 
-    try:
-        # Extract month and year
-        parts = date_str.strip().lower().split()
-        if len(parts) >= 2:
-            month_name = parts[0]
-            year = int(parts[1])
-
-            if month_name in french_months:
-                month = french_months[month_name]
-                # Create datetime object (using first day of month)
-                return datetime(year, month, 1)
-        return None
-    except Exception as e:
-        return None
+def parse_raw_columns(df):
+    """Fill the parsed columns from the scraped raw text columns, one vectorized pass per field"""
+    if 'price_raw' in df.columns:
+        df['price'] = parse_price_series(df['price_raw'])
+    if 'kilometers_raw' in df.columns:
+        df['kilometers'] = parse_kilometers_series(df['kilometers_raw'])
+    if 'registration_date_raw' in df.columns:
+        df['registration_date'] = parse_registration_series(df['registration_date_raw'])
+    if 'horse_power_raw' in df.columns:
+        df['horse_power_kw'], df['horse_power_ps'] = parse_horse_power_series(df['horse_power_raw'])
+    if 'battery_range_raw' in df.columns:
+        df['battery_range_km'] = parse_battery_range_series(df['battery_range_raw'])
+    return df
+
+
+def _step_score(values, thresholds, scores):
+    """Map values onto step scores: scores[i] for values at or above thresholds[i - 1], NaN when missing"""
+    values = values.to_numpy(dtype='float64', na_value=np.nan)
+    bins = np.searchsorted(thresholds, values, side='right')
+    return np.where(np.isnan(values), np.nan, scores[bins])
+
+
+def _weighted_score(df, columns, weights):
+    """Row-wise weighted sum of score columns, skipping missing ones; NaN when all are missing"""
+    block = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    return np.where(np.isnan(block).all(axis=1), np.nan, np.nansum(block * weights, axis=1))
 
 
 def calculate_age_metrics(df):
@@ -838,29 +806,20 @@ def calculate_age_metrics(df):
     df = df.copy()
     current_date = datetime.now()
 
+    registration = pd.to_datetime(df['registration_date'], errors='coerce')
+
     # Calculate age in months
-    df['age_months'] = df['registration_date'].apply(
-        lambda x: (current_date.year - x.year) * 12 + (current_date.month - x.month)
-        if pd.notna(x) else None
-    )
+    df['age_months'] = (current_date.year - registration.dt.year) * 12 + (current_date.month - registration.dt.month)
 
     # Calculate age in years (for annual mileage)
     df['age_years'] = df['age_months'] / 12.0
 
     # Calculate annual mileage (kilometers per year)
-    df['annual_mileage'] = df.apply(
-        lambda row: row['kilometers'] / row['age_years']
-        if pd.notna(row['kilometers']) and pd.notna(row['age_years']) and row['age_years'] > 0
-        else None,
-        axis=1
-    )
+    df['annual_mileage'] = df['kilometers'].astype('float64') / df['age_years'].where(df['age_years'] > 0)
 
     # Newness score (higher for newer cars, 0-100 scale)
     # 2024 cars = 100, decreasing by 10 per year
-    df['newness_score'] = df['registration_date'].apply(
-        lambda x: max(0, 100 - (current_date.year - x.year) * 10)
-        if pd.notna(x) else None
-    )
+    df['newness_score'] = (100 - (current_date.year - registration.dt.year) * 10).clip(lower=0)
 
     return df
 
@@ -976,38 +935,25 @@ def calculate_age_usage_scores(df):
 
     # Annual mileage score (lower mileage = better, 0-100 scale)
     # Bonus for < 10k km/year, penalty for > 20k km/year
-    valid_annual = df['annual_mileage'].dropna()
-    if len(valid_annual) > 0:
-        # Use a scoring function: 100 for 0 km/year, decreasing linearly
-        # Optimal: < 10k km/year = high score (80-100)
-        # Good: 10-15k km/year = medium-high (60-80)
-        # Acceptable: 15-20k km/year = medium (40-60)
-        # High: > 20k km/year = low (0-40)
-        def mileage_score(annual_km):
-            if pd.isna(annual_km):
-                return None
-            if annual_km <= 10000:
-                return 80 + (10000 - annual_km) / 10000 * 20  # 80-100
-            elif annual_km <= 15000:
-                return 60 + (15000 - annual_km) / 5000 * 20  # 60-80
-            elif annual_km <= 20000:
-                return 40 + (20000 - annual_km) / 5000 * 20  # 40-60
-            else:
-                return max(0, 40 - (annual_km - 20000) / 10000 * 40)  # 0-40
-
-        df['usage_score'] = df['annual_mileage'].apply(mileage_score)
-    else:
-        df['usage_score'] = None
+    # Piecewise linear, 100 for 0 km/year, decreasing linearly:
+    # Optimal: < 10k km/year = high score (80-100)
+    # Good: 10-15k km/year = medium-high (60-80)
+    # Acceptable: 15-20k km/year = medium (40-60)
+    # High: > 20k km/year = low (0-40)
+    annual_km = df['annual_mileage'].to_numpy(dtype='float64')
+    mileage_score = np.select(
+        [annual_km <= 10000, annual_km <= 15000, annual_km <= 20000],
+        [
+            80 + (10000 - annual_km) / 10000 * 20,
+            60 + (15000 - annual_km) / 5000 * 20,
+            40 + (20000 - annual_km) / 5000 * 20
+        ],
+        default=np.maximum(0, 40 - (annual_km - 20000) / 10000 * 40)
+    )
+    df['usage_score'] = np.where(np.isnan(annual_km), np.nan, mileage_score)
 
     # Overall age & usage score (weighted average: 40% age, 40% usage, 20% newness)
-    df['age_usage_score'] = df.apply(
-        lambda row: pd.Series([
-            row['age_score'] * 0.4 if pd.notna(row['age_score']) else None,
-            row['usage_score'] * 0.4 if pd.notna(row['usage_score']) else None,
-            row['newness_score'] * 0.2 if pd.notna(row['newness_score']) else None
-        ]).sum() if any(pd.notna([row['age_score'], row['usage_score'], row['newness_score']])) else None,
-        axis=1
-    )
+    df['age_usage_score'] = _weighted_score(df, ['age_score', 'usage_score', 'newness_score'], AGE_USAGE_WEIGHTS)
 
     return df
 
@@ -1025,42 +971,10 @@ def calculate_performance_range_scores(df):
     )
 
     # Range adequacy score (bonus for >= 400 km)
-    def range_adequacy_score(range_km):
-        if pd.isna(range_km):
-            return None
-        if range_km >= 500:
-            return 100
-        elif range_km >= 450:
-            return 90
-        elif range_km >= 400:
-            return 80
-        elif range_km >= 350:
-            return 60
-        elif range_km >= 300:
-            return 40
-        else:
-            return 20
-
-    df['range_adequacy_score'] = df['battery_range_km'].apply(range_adequacy_score)
+    df['range_adequacy_score'] = _step_score(df['battery_range_km'], RANGE_ADEQUACY_THRESHOLDS, ADEQUACY_SCORES)
 
     # Power adequacy score (bonus for >= 200 kW)
-    def power_adequacy_score(power_kw):
-        if pd.isna(power_kw):
-            return None
-        if power_kw >= 300:
-            return 100
-        elif power_kw >= 250:
-            return 90
-        elif power_kw >= 200:
-            return 80
-        elif power_kw >= 150:
-            return 60
-        elif power_kw >= 100:
-            return 40
-        else:
-            return 20
-
-    df['power_adequacy_score'] = df['horse_power_kw'].apply(power_adequacy_score)
+    df['power_adequacy_score'] = _step_score(df['horse_power_kw'], POWER_ADEQUACY_THRESHOLDS, ADEQUACY_SCORES)
 
     # Range efficiency score (normalized 0-100, higher is better)
     valid_efficiency = df['range_efficiency'].dropna()
@@ -1078,15 +992,8 @@ def calculate_performance_range_scores(df):
         df['range_efficiency_score'] = None
 
     # Overall performance/range score (weighted: 40% range adequacy, 30% power adequacy, 30% efficiency)
-    df['performance_range_score'] = df.apply(
-        lambda row: pd.Series([
-            row['range_adequacy_score'] * 0.4 if pd.notna(row['range_adequacy_score']) else None,
-            row['power_adequacy_score'] * 0.3 if pd.notna(row['power_adequacy_score']) else None,
-            row['range_efficiency_score'] * 0.3 if pd.notna(row['range_efficiency_score']) else None
-        ]).sum() if any(pd.notna([row['range_adequacy_score'],
-                                  row['power_adequacy_score'],
-                                  row['range_efficiency_score']])) else None,
-        axis=1
+    df['performance_range_score'] = _weighted_score(
+        df, ['range_adequacy_score', 'power_adequacy_score', 'range_efficiency_score'], PERFORMANCE_RANGE_WEIGHTS
     )
 
     return df
@@ -1266,14 +1173,31 @@ def calculate_final_score(df):
 
     return df
 
+# Command-line options (parse_known_args so extra interpreter/kernel args are ignored)
+arg_parser = argparse.ArgumentParser(description="BMW car scraping exploration script")
+arg_parser.add_argument('--interactive', action='store_true',
+                        help="Keep the browser open until Enter is pressed")
+arg_parser.add_argument('--headed', action='store_true',
+                        help="Show the browser window (implied by --interactive); headless otherwise")
+arg_parser.add_argument('--verbose', action='store_true',
+                        help="Log every extracted field of each car (DEBUG level)")
+args, _ = arg_parser.parse_known_args()
+if args.verbose:
+    logger.setLevel(logging.DEBUG)
+
 logger.info("=" * 60)
 logger.info("Starting BMW car scraping script")
 logger.info("=" * 60)
 
-with sync_playwright() as p:
-    logger.info("[1/4] Launching browser...")
-    browser = p.chromium.launch(headless=False)
-    page = browser.new_page()
+# closing() guarantees browser.close() even if the run fails midway
+headless = not (args.headed or args.interactive)
+with sync_playwright() as p, closing(p.chromium.launch(headless=headless, args=BROWSER_ARGS)) as browser:
+    logger.info(f"[1/4] Launching browser ({'headless' if headless else 'headed'})...")
+    # Routing and consent cookies live on the context, so every detail tab shares them
+    context = browser.new_context(user_agent=BROWSER_USER_AGENT)
+    context.route("**/*", route_request)
+    context.add_init_script(HIDE_WEBDRIVER_JS)
+    page = context.new_page()
 
     logger.info(f"[2/4] Navigating to URL...")
     logger.info(f"      {url[:80]}...")
@@ -1286,30 +1210,42 @@ with sync_playwright() as p:
     logger.info("      ✓ Cookies popup found, accepting...")
     accept_button.click()
 
-    # Wait for page to load after accepting cookies
-    page.wait_for_timeout(2000)
+    # The popup closing marks the click as handled, and the listing is ready once its first card
+    # renders; the page reached DOMContentLoaded long before, so waiting on that would not wait at all
+    try:
+        accept_button.wait_for(state='hidden', timeout=5000)
+        page.locator(MODEL_CARD_SEL).first.wait_for(state='attached', timeout=15000)
+    except Exception as e:
+        logger.warning(f"      ⚠ Listing not ready after accepting cookies, continuing anyway ({str(e)})")
     logger.info("      ✓ Cookies accepted, page loaded")
 
     # Scroll down and click "Montrer plus" button until it's no longer visible
     logger.info("[4/4] Loading all car listings...")
-    show_more_button = page.locator('[data-test="stolo-plp-show-more-button"]')
+    show_more_button = page.locator(SHOW_MORE_SEL)
+    card_count = page.locator(MODEL_CARD_SEL).count()
     click_count = 0
 
     while True:
         # Scroll down to load more content
         page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(2000)
 
-        # Try to find and click the button
+        # Try to find and click the button (wait_for below waits for it to render)
         try:
             show_more_button.wait_for(state='visible', timeout=5000)
             show_more_button.scroll_into_view_if_needed()
             click_count += 1
             logger.info(f"      → Clicking 'Montrer plus' button (click #{click_count})...")
             show_more_button.click()
-            # Wait for content to load after clicking
-            page.wait_for_timeout(3000)
-            logger.info(f"      ✓ Content loaded (click #{click_count} completed)")
+            # Wait for new cards to render instead of a fixed delay
+            try:
+                page.wait_for_function(
+                    f"document.querySelectorAll('{MODEL_CARD_SEL}').length > {card_count}",
+                    timeout=10000
+                )
+            except Exception:
+                pass
+            card_count = page.locator(MODEL_CARD_SEL).count()
+            logger.info(f"      ✓ Content loaded (click #{click_count} completed, {card_count} cards)")
         except:
             # Button is no longer visible or doesn't exist, we're done
             logger.info(f"      ✓ No more 'Montrer plus' buttons found. Total clicks: {click_count}")
@@ -1317,25 +1253,9 @@ with sync_playwright() as p:
 
     # Extract all model card links
     logger.info("[Extracting links] Finding all car detail links...")
-    model_card_links = page.locator('a.model-card-link')
-    links = []
-
-    count = model_card_links.count()
-    logger.info(f"      Found {count} model card elements")
-
-    for i in range(count):
-        href = model_card_links.nth(i).get_attribute('href')
-        if href:
-            # Construct full URL if it's a relative path
-            if href.startswith('/'):
-                full_url = f"https://www.bmw.be{href}"
-            else:
-                full_url = href
-            links.append(full_url)
-
-        # Progress indicator every 10 links
-        if (i + 1) % 10 == 0:
-            logger.info(f"      Processed {i + 1}/{count} links...")
+    # All hrefs in one round-trip, made absolute in the page: relative paths get the site origin
+    links = page.eval_on_selector_all(MODEL_CARD_SEL, CARD_LINKS_JS)
+    logger.info(f"      Found {len(links)} model card links")
 
     logger.info("=" * 60)
     logger.info(f"SUMMARY: Found {len(links)} car detail links")
@@ -1345,176 +1265,103 @@ with sync_playwright() as p:
 
     # Function to extract car data from a single page
     def extract_car_data(page, link):
-        """Extract all car information from a detail page"""
+        """Extract all car information from a detail page whose navigation to link has already started"""
         car_data = {}
 
-        # Navigate to car detail page
-        page.goto(link)
-        page.wait_for_timeout(3000)
-
-        # Check if cookies need to be accepted
+        # The heading renders once the page has loaded, so this wait also covers the navigation
         try:
-            accept_button = page.get_by_role("button", name="Tout accepter")
-            if accept_button.is_visible(timeout=2000):
-                accept_button.click()
-                page.wait_for_timeout(2000)
-        except:
-            pass  # No cookies popup, continue
+            page.wait_for_selector(CAR_SELECTORS['model_name'], timeout=30000)
+        except Exception as e:
+            logger.warning(f"      ⚠ Heading not found, extracting anyway ({str(e)})")
 
-        # Model name
+        # All fields in one browser round-trip instead of one per locator; the key facts gate them
         try:
-            model_name = page.locator('h1#stock-locator__details-heading-1').inner_text()
-            car_data['model_name'] = model_name.strip()
-            logger.info(f"      → model_name: {car_data['model_name']}")
+            page.wait_for_selector(KEY_FACTS_SEL, timeout=5000)
         except Exception as e:
-            car_data['model_name'] = None
-            logger.warning(f"      → model_name: Not found ({str(e)})")
+            logger.warning(f"      ⚠ Key facts section not found, extracting anyway ({str(e)})")
+
+        # The technical data table and the equipment panels render separately from the key facts;
+        # a missing section is reported as a missing field below
+        for selector, state in DETAIL_SECTION_WAITS:
+            try:
+                page.wait_for_selector(selector, state=state, timeout=5000)
+            except Exception as e:
+                logger.debug(f"      → Detail section not found ({str(e)})")
+        fields = page.evaluate(EXTRACT_CAR_JS, [CAR_SELECTORS, KEY_FACT_TITLES])
+
+        # Model name
+        car_data['model_name'] = fields['model_name'] or None
+        if car_data['model_name']:
+            logger.debug(f"      → model_name: {car_data['model_name']}")
+        else:
+            logger.warning("      → model_name: Not found")
 
         # Car ID
-        try:
-            car_id_element = page.locator('div.vehicle-intro__vin')
-            car_id_text = car_id_element.inner_text()
-            car_id_raw = car_id_text.replace('CAR-ID', '').strip()
+        if fields['car_id']:
+            car_id_raw = fields['car_id'].replace('CAR-ID', '').strip()
             car_data['car_id'] = parse_car_id(car_id_raw)
-            logger.info(f"      → car_id: {car_data['car_id']} (raw: {car_id_raw})")
-        except Exception as e:
+            logger.debug(f"      → car_id: {car_data['car_id']} (raw: {car_id_raw})")
+        else:
             car_data['car_id'] = None
-            logger.warning(f"      → car_id: Not found ({str(e)})")
+            logger.warning("      → car_id: Not found")
 
         # Price
-        try:
-            price_element = page.locator('div.subtitle-0.price strong')
-            price_text = price_element.inner_text().strip()
-            car_data['price_raw'] = price_text
-            car_data['price'] = parse_price(price_text)
-            logger.info(f"      → price: {car_data['price']} (raw: {car_data['price_raw']})")
-        except Exception as e:
-            car_data['price_raw'] = None
-            car_data['price'] = None
-            logger.warning(f"      → price: Not found ({str(e)})")
+        car_data['price_raw'] = fields['price'] or None
+        if car_data['price_raw']:
+            logger.debug(f"      → price (raw): {car_data['price_raw']}")
+        else:
+            logger.warning("      → price: Not found")
 
         # Link
         car_data['link'] = link
-        logger.info(f"      → link: {link}")
+        logger.debug(f"      → link: {link}")
 
         # Kilometers
-        try:
-            # Wait for the kilometers key-fact to be visible
-            mileage_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Kilomètres"]')
-            mileage_key_fact.wait_for(state='visible', timeout=5000)
-            # Get the value from the nested div
-            mileage_value = mileage_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-            if not mileage_value:
-                # Fallback: try direct child selector
-                mileage_value = mileage_key_fact.locator('div.value.caption').inner_text().strip()
-            car_data['kilometers_raw'] = mileage_value
-            car_data['kilometers'] = parse_kilometers(mileage_value)
-            logger.info(f"      → kilometers: {car_data['kilometers']} (raw: {car_data['kilometers_raw']})")
-        except Exception as e:
-            car_data['kilometers_raw'] = None
-            car_data['kilometers'] = None
-            logger.warning(f"      → kilometers: Not found ({str(e)})")
+        car_data['kilometers_raw'] = fields['kilometers'] or None
+        if car_data['kilometers_raw']:
+            logger.debug(f"      → kilometers (raw): {car_data['kilometers_raw']}")
+        else:
+            logger.warning("      → kilometers: Not found")
 
         # Registration date
-        try:
-            registration_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Date d\'immatriculation"]')
-            registration_key_fact.wait_for(state='visible', timeout=5000)
-            registration_value = registration_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-            if not registration_value:
-                registration_value = registration_key_fact.locator('div.value.caption').inner_text().strip()
-            car_data['registration_date_raw'] = registration_value
-            car_data['registration_date'] = parse_registration_date(registration_value)
-            logger.info(f"      → registration_date: {car_data['registration_date']} (raw: {car_data['registration_date_raw']})")
-        except Exception as e:
-            car_data['registration_date_raw'] = None
-            car_data['registration_date'] = None
-            logger.warning(f"      → registration_date: Not found ({str(e)})")
+        car_data['registration_date_raw'] = fields['registration_date'] or None
+        if car_data['registration_date_raw']:
+            logger.debug(f"      → registration_date (raw): {car_data['registration_date_raw']}")
+        else:
+            logger.warning("      → registration_date: Not found")
 
         # Horse power
-        try:
-            power_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Power Based on Degree of Electrification"]')
-            power_key_fact.wait_for(state='visible', timeout=5000)
-            power_value = power_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-            if not power_value:
-                power_value = power_key_fact.locator('div.value.caption').inner_text().strip()
-            car_data['horse_power_raw'] = power_value
-            kw, ps = parse_horse_power(power_value)
-            car_data['horse_power_kw'] = kw
-            car_data['horse_power_ps'] = ps
-            logger.info(f"      → horse_power_kw: {car_data['horse_power_kw']}, horse_power_ps: {car_data['horse_power_ps']} (raw: {car_data['horse_power_raw']})")
-        except Exception as e:
-            car_data['horse_power_raw'] = None
-            car_data['horse_power_kw'] = None
-            car_data['horse_power_ps'] = None
-            logger.warning(f"      → horse_power: Not found ({str(e)})")
+        car_data['horse_power_raw'] = fields['horse_power'] or None
+        if car_data['horse_power_raw']:
+            logger.debug(f"      → horse_power (raw): {car_data['horse_power_raw']}")
+        else:
+            logger.warning("      → horse_power: Not found")
 
         # Battery range (Autonomie électrique)
-        try:
-            # Find the technical data table row containing the battery range
-            battery_range_container = page.locator('div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]').locator('xpath=ancestor::div[contains(@class, "technical-data_table")]')
-            battery_range_container.wait_for(state='visible', timeout=5000)
-            # Get the value from the headline-5 div within the same container
-            battery_range_value = battery_range_container.locator('div.headline-5 span').inner_text().strip()
-            if not battery_range_value:
-                # Fallback: try direct sibling
-                battery_range_label = page.locator('div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]')
-                battery_range_value = battery_range_label.locator('xpath=following-sibling::div[contains(@class, "headline-5")]//span').inner_text().strip()
-            car_data['battery_range_raw'] = battery_range_value
-            car_data['battery_range_km'] = parse_battery_range(battery_range_value)
-            logger.info(f"      → battery_range_km: {car_data['battery_range_km']} (raw: {car_data['battery_range_raw']})")
-        except Exception as e:
-            car_data['battery_range_raw'] = None
-            car_data['battery_range_km'] = None
-            logger.warning(f"      → battery_range: Not found ({str(e)})")
+        car_data['battery_range_raw'] = fields['battery_range'] or None
+        if car_data['battery_range_raw']:
+            logger.debug(f"      → battery_range (raw): {car_data['battery_range_raw']}")
+        else:
+            logger.warning("      → battery_range: Not found")
 
         # Extract equipment information
         equipment_data = {}
         try:
-            # Look for all equipment sections (section-7, section-8, etc.)
-            # Use the class selector to find all equipment sections
-            equipment_sections = page.locator('section.equipment-section-container')
-            section_count = equipment_sections.count()
-
-            # Process all equipment sections found on the page
-            for section_idx in range(section_count):
-                try:
-                    equipment_section = equipment_sections.nth(section_idx)
-                    accordion_panels = equipment_section.locator('neo-accordion-panel')
-                    panel_count = accordion_panels.count()
-
-                    for i in range(panel_count):
-                        panel = accordion_panels.nth(i)
-                        try:
-                            header = panel.locator('.content-header')
-                            category_name = header.locator('.header-label').inner_text().strip()
-                            equipment_items = panel.locator('div.details-card')
-                            item_count = equipment_items.count()
-
-                            equipment_list = []
-                            for j in range(item_count):
-                                item = equipment_items.nth(j)
-                                equipment_name = item.locator('div.headline-7.tw-mb-ng-300').inner_text().strip()
-                                if equipment_name:
-                                    equipment_list.append(equipment_name)
-
-                            # If category already exists, merge the lists (to handle duplicates across sections)
-                            if category_name and equipment_list:
-                                if category_name in equipment_data:
-                                    # Merge lists, avoiding duplicates
-                                    existing_items = set(equipment_data[category_name])
-                                    new_items = [item for item in equipment_list if item not in existing_items]
-                                    equipment_data[category_name].extend(new_items)
-                                else:
-                                    equipment_data[category_name] = equipment_list
-                        except Exception as e:
-                            continue
-                except Exception as e:
-                    continue
+            for category_name, equipment_list in fields['equipment_panels']:
+                # If category already exists, merge the lists (to handle duplicates across sections)
+                if category_name and equipment_list:
+                    if category_name in equipment_data:
+                        # Merge lists, avoiding duplicates
+                        existing_items = set(equipment_data[category_name])
+                        new_items = [item for item in equipment_list if item not in existing_items]
+                        equipment_data[category_name].extend(new_items)
+                    else:
+                        equipment_data[category_name] = equipment_list
 
-            car_data['equipments'] = json.dumps(equipment_data, ensure_ascii=False, indent=2) if equipment_data else None
+            car_data['equipments'] = dump_equipment(equipment_data) if equipment_data else None
             if car_data['equipments']:
                 equipment_count = sum(len(items) for items in equipment_data.values())
-                logger.info(f"      → equipments: Found {len(equipment_data)} categories with {equipment_count} total items")
+                logger.debug(f"      → equipments: Found {len(equipment_data)} categories with {equipment_count} total items")
             else:
                 logger.warning(f"      → equipments: Not found")
         except Exception as e:
@@ -1535,31 +1382,46 @@ with sync_playwright() as p:
 
     all_cars_data = []
 
-    for idx, link in enumerate(test_links, 1):
-        logger.info(f"[{idx}/{len(test_links)}] Processing car {idx}...")
-        logger.info(f"      Link: {link[:80]}...")
-
-        try:
-            car_data = extract_car_data(page, link)
-            all_cars_data.append(car_data)
-            logger.info(f"      ✓ Car {idx} data extracted successfully")
-            if car_data.get('model_name'):
-                logger.info(f"      → Model: {car_data['model_name']}")
-        except Exception as e:
-            logger.error(f"      ✗ Error processing car {idx}: {str(e)}")
-            # Still add a record with link and error info
-            error_data = {'link': link, 'error': str(e)}
-            all_cars_data.append(error_data)
+    # Detail pages are network-bound: start the navigations of DETAIL_TABS cars in their own tabs,
+    # then read them in order while the others keep loading. Each tab is closed after its car
+    for start in range(0, len(test_links), DETAIL_TABS):
+        batch = list(enumerate(test_links[start:start + DETAIL_TABS], start + 1))
+        tabs = {}
+        results = {}
+        for idx, link in batch:
+            logger.debug(f"[{idx}/{len(test_links)}] Processing car {idx}: {link}")
+            tab = context.new_page()
+            try:
+                tab.goto(link, wait_until='commit')
+                tabs[idx] = tab
+            except Exception as e:
+                tab.close()
+                results[idx] = e
 
-        # Small delay between requests
-        page.wait_for_timeout(1000)
+        for idx, link in batch:
+            if idx in tabs:
+                try:
+                    results[idx] = extract_car_data(tabs[idx], link)
+                except Exception as e:
+                    results[idx] = e
+                finally:
+                    tabs[idx].close()
+
+            if isinstance(results[idx], Exception):
+                logger.error(f"      ✗ Error processing car {idx}: {str(results[idx])}")
+                # Still add a record with link and error info
+                all_cars_data.append({'link': link, 'error': str(results[idx])})
+            else:
+                car_data = results[idx]
+                all_cars_data.append(car_data)
+                # One INFO line per car; the per-field details are logged at DEBUG level
+                logger.info(f"[{idx}/{len(test_links)}] ✓ {car_data.get('model_name') or 'Unknown model'} - {link[:80]}")
 
     logger.info(f"      ✓ Successfully processed {len(all_cars_data)} cars")
 
-    # Create pandas DataFrame from all cars
-    df = pd.DataFrame(all_cars_data)
-
-    # Reorder columns for better readability
+    # Build the DataFrame column by column, in display order, instead of from the list of row
+    # dicts; only columns that some car has are included. The raw text columns are parsed
+    # afterwards, one vectorized pass per field instead of once per car
     column_order = [
         'model_name', 'car_id', 'price', 'price_raw',
         'kilometers', 'kilometers_raw',
@@ -1568,9 +1430,13 @@ with sync_playwright() as p:
         'battery_range_km', 'battery_range_raw',
         'equipments', 'link'
     ]
-    # Only include columns that exist
-    existing_columns = [col for col in column_order if col in df.columns]
-    df = df[existing_columns]
+    found_columns = {col for car in all_cars_data for col in car}
+    df = pd.DataFrame({
+        col: [car.get(col, np.nan) for car in all_cars_data]
+        for col in column_order if col in found_columns
+    })
+    df = parse_raw_columns(df)
+    df = df[[col for col in column_order if col in df.columns]]
 
     # Calculate all scoring metrics
     preferences_file = "data/ardonis_bmw_preferences.json"
@@ -1646,7 +1512,7 @@ with sync_playwright() as p:
 
     # Keep tracking columns + link for historical data
     tracking_cols_with_link = TRACKING_COLUMNS + ['link']
-    df_tracking = df[tracking_cols_with_link].copy()
+    df_tracking = df.loc[:, tracking_cols_with_link]
 
     # Load historical data
     history_file = f"{output_dir}/bmw_cars_history.csv"
@@ -1658,15 +1524,9 @@ with sync_playwright() as p:
 
     # Save merged history to CSV
     try:
-        # Convert datetime columns to string format for CSV
-        df_history_export = merged_history.copy()
-        for col in ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']:
-            if col in df_history_export.columns:
-                df_history_export[col] = df_history_export[col].astype(str)
-
-        df_history_export.to_csv(history_file, index=False)
+        save_history_csv(merged_history, history_file)
         logger.info(f"      ✓ Historical data saved: {history_file}")
-        logger.info(f"      ✓ Total historical records: {len(df_history_export)}")
+        logger.info(f"      ✓ Total historical records: {len(merged_history)}")
     except Exception as e:
         logger.error(f"      ✗ Error saving history: {str(e)}")
 
@@ -1677,15 +1537,9 @@ with sync_playwright() as p:
 
     # Save equipment history to CSV
     try:
-        # Convert datetime columns to string format for CSV
-        df_equipment_export = merged_equipment.copy()
-        for col in ['valid_from', 'valid_to', 'scrape_date']:
-            if col in df_equipment_export.columns:
-                df_equipment_export[col] = df_equipment_export[col].astype(str)
-
-        df_equipment_export.to_csv(equipment_file, index=False)
+        save_history_csv(merged_equipment, equipment_file)
         logger.info(f"      ✓ Equipment history saved: {equipment_file}")
-        logger.info(f"      ✓ Total equipment records: {len(df_equipment_export)}")
+        logger.info(f"      ✓ Total equipment records: {len(merged_equipment)}")
     except Exception as e:
         logger.error(f"      ✗ Error saving equipment history: {str(e)}")
 
@@ -1701,7 +1555,7 @@ with sync_playwright() as p:
     score_cols = ['car_id', 'value_efficiency_score', 'age_usage_score',
                   'performance_range_score', 'equipment_score', 'final_score']
     if all(col in df.columns for col in score_cols):
-        df_scores = df[score_cols].copy()
+        df_scores = df[score_cols]
         # Merge scores into merged_history for scores history processing
         merged_history_with_scores = merged_history.merge(
             df_scores,
@@ -1715,15 +1569,9 @@ with sync_playwright() as p:
 
     # Save scores history to CSV
     try:
-        # Convert datetime columns to string format for CSV
-        df_scores_export = merged_scores.copy()
-        for col in ['valid_from', 'valid_to', 'scrape_date']:
-            if col in df_scores_export.columns:
-                df_scores_export[col] = df_scores_export[col].astype(str)
-
-        df_scores_export.to_csv(scores_file, index=False)
+        save_history_csv(merged_scores, scores_file)
         logger.info(f"      ✓ Scores history saved: {scores_file}")
-        logger.info(f"      ✓ Total scores records: {len(df_scores_export)}")
+        logger.info(f"      ✓ Total scores records: {len(merged_scores)}")
     except Exception as e:
         logger.error(f"      ✗ Error saving scores history: {str(e)}")
 
@@ -1756,15 +1604,10 @@ with sync_playwright() as p:
 
     # Export DataFrame to Excel
     try:
-        # Create a copy for export
-        df_export = latest_records.copy()
-
         # Convert datetime objects to strings for Excel compatibility
-        for col in ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']:
-            if col in df_export.columns:
-                df_export[col] = df_export[col].astype(str)
+        df_export = prepare_excel_export(latest_records)
 
-        df_export.to_excel(excel_filename, index=False, engine='openpyxl')
+        save_excel(df_export, excel_filename)
         logger.info(f"      ✓ Excel file exported: {excel_filename}")
         logger.info(f"      ✓ Total rows exported: {len(df_export)}")
 
@@ -1780,8 +1623,8 @@ with sync_playwright() as p:
         logger.info(f"Total unique cars seen: {len(merged_history['car_id'].unique())}")
     except Exception as e:
         logger.error(f"      ✗ Error exporting to Excel: {str(e)}")
-        logger.warning(f"      → Make sure openpyxl is installed: pip install openpyxl")
+        logger.warning(f"      → Make sure xlsxwriter is installed: pip install xlsxwriter")
 
-    logger.info("\nPress Enter to close the browser...")
-    input()
-    browser.close()
\ No newline at end of file
+    if args.interactive:
+        logger.info("\nPress Enter to close the browser...")
+        input()
\ No newline at end of file
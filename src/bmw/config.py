@@ -14,10 +14,15 @@ IS_AZURE = os.getenv("FUNCTIONS_WORKER_RUNTIME") is not None
 SUPABASE_URL = os.getenv("SUPABASE_URL", "")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY", "")
 
+# Logging level; DEBUG adds the per-field details of every scraped car
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+
 # Scraping Configuration
 BMW_URL = "https://www.bmw.be/fr-be/sl/stocklocator_uc/results?filters=%257B%2522MARKETING_MODEL_RANGE%2522%253A%255B%2522i4_G26E%2522%255D%252C%2522COLOR%2522%253A%255B%2522GRAY%2522%252C%2522BLACK%2522%255D%252C%2522USED_CAR_MILEAGE%2522%253A%255B0%252C20000%255D%252C%2522REGISTRATION_YEAR%2522%253A%255B2025%252C2025%255D%252C%2522EQUIPMENT_GROUPS%2522%253A%257B%2522favorites%2522%253A%255B%2522M%2520Sport%2520package%2522%255D%257D%257D"
 HEADLESS_MODE = True
 BROWSER_TIMEOUT = 10000
+# Car detail pages fetched concurrently (tabs in one browser context)
+SCRAPE_WORKERS = 4
 
 # File Paths - Azure Functions use /tmp for writable storage
 if IS_AZURE:
@@ -33,12 +38,42 @@ else:
     OUTPUT_DIR = "results/bmw"
     PREFERENCES_FILE = "data/ardonis_bmw_preferences.json"
 
+# Saved browser cookies/consent, reused across runs to skip the cookie banner
+BROWSER_STATE_FILE = f"{OUTPUT_DIR}/bmw_browser_state.json"
+
+# Car records of the running scrape, one JSON line each; a run that dies midway is resumed
+# from here by the next run on the same day
+SCRAPE_CHECKPOINT_FILE = f"{OUTPUT_DIR}/bmw_scrape_checkpoint.jsonl"
+
+# Scraped car columns and their pandas dtypes (also defines the column order)
+CAR_DATA_SCHEMA = {
+    'model_name': 'string',
+    'car_id': 'Int64',
+    'price': 'Float64',
+    'price_raw': 'string',
+    'kilometers': 'Int64',
+    'kilometers_raw': 'string',
+    'registration_date': 'datetime64[ns]',
+    'registration_date_raw': 'string',
+    'horse_power_kw': 'Int64',
+    'horse_power_ps': 'Int64',
+    'horse_power_raw': 'string',
+    'battery_range_km': 'Int64',
+    'battery_range_raw': 'string',
+    'equipments': 'string',
+    'link': 'string'
+}
+
 # Tracking Columns
 TRACKING_COLUMNS = [
     'car_id', 'model_name', 'price', 'kilometers', 'registration_date',
     'horse_power_kw', 'horse_power_ps', 'battery_range_km', 'equipments'
 ]
 
+# Tracking columns compared as numbers / dates (all others are compared as strings)
+NUMERIC_TRACKING_COLUMNS = ['price', 'kilometers', 'horse_power_kw', 'horse_power_ps', 'battery_range_km']
+DATE_TRACKING_COLUMNS = ['registration_date']
+
 HISTORY_COLUMNS = [
     'car_id', 'model_name', 'price', 'kilometers', 'registration_date',
     'horse_power_kw', 'horse_power_ps', 'battery_range_km', 'equipments',
@@ -57,6 +92,13 @@ SCORES_COLUMNS = [
     'is_latest', 'scrape_date'
 ]
 
+# The only values of the history status column
+STATUS_VALUES = ['active', 'sold']
+
+# SCD date columns written out as strings, and rows per to_csv write batch
+SCD_DATE_COLUMNS = ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']
+CSV_WRITE_CHUNK_ROWS = 50000
+
 # French month mapping
 FRENCH_MONTHS = {
     'janvier': 1, 'février': 2, 'mars': 3, 'avril': 4,
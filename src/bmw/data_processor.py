@@ -1,23 +1,54 @@
-import json
 import logging
 import os
 from datetime import datetime
 
+import numpy as np
+import orjson
 import pandas as pd
-
-from .config import EQUIPMENT_COLUMNS, HISTORY_COLUMNS, SCORES_COLUMNS, TRACKING_COLUMNS
+import xlsxwriter
+
+from .config import (
+    CSV_WRITE_CHUNK_ROWS,
+    DATE_TRACKING_COLUMNS,
+    EQUIPMENT_COLUMNS,
+    HISTORY_COLUMNS,
+    NUMERIC_TRACKING_COLUMNS,
+    SCD_DATE_COLUMNS,
+    SCORES_COLUMNS,
+    STATUS_VALUES,
+    TRACKING_COLUMNS,
+)
 
 logger = logging.getLogger(__name__)
 
+STATUS_DTYPE = pd.CategoricalDtype(STATUS_VALUES)
+
+
+def _archive_path(history_file):
+    """Path of the append-only file holding history rows closed before the last run"""
+    return f"{os.path.splitext(history_file)[0]}_closed.csv"
+
+
+def _read_history_csv(path):
+    """Read one history CSV with typed car_id/status, parsed SCD dates and boolean is_latest"""
+    df = pd.read_csv(
+        path,
+        dtype={'car_id': 'Int64', 'status': STATUS_DTYPE},
+        parse_dates=['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date'],
+        date_format='ISO8601',
+        na_values=['NaT'],
+    )
+    df['is_latest'] = df['is_latest'].eq(True)
+    return df
+
 
 def load_historical_data(history_file):
-    """Load historical car data from CSV"""
-    if os.path.exists(history_file):
+    """Load historical car data from CSV, archived closed rows first"""
+    paths = [path for path in [_archive_path(history_file), history_file] if os.path.exists(path)]
+    if paths:
         try:
-            df = pd.read_csv(history_file, dtype={'car_id': 'Int64'})
-            for col in ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
+            frames = [_read_history_csv(path) for path in paths]
+            df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
             logger.info(f"Loaded {len(df)} historical records from {history_file}")
             return df
         except Exception as e:
@@ -26,25 +57,120 @@ def load_historical_data(history_file):
     return pd.DataFrame(columns=HISTORY_COLUMNS)
 
 
+def stringify_dates(df):
+    """Return df with its SCD date columns as strings, sharing the other columns' data (read-only use)"""
+    # assign() deep-copies the whole frame; setting a column on a shallow copy replaces it there only
+    out = df.copy(deep=False)
+    for col in df.columns.intersection(SCD_DATE_COLUMNS, sort=False):
+        out[col] = df[col].astype(str)
+    return out
+
+
+def prepare_excel_export(df):
+    """Return df ready for the Excel export: SCD dates as strings, registration_date as YYYY-MM-DD in one vectorized pass"""
+    out = stringify_dates(df)
+    if 'registration_date' in out.columns:
+        # History rows hold strings and freshly scraped rows Timestamps; format both alike instead of per cell
+        out['registration_date'] = _format_dates(df['registration_date'], None)
+    return out
+
+
+def _history_csv_frame(df):
+    """Return df as written to the history CSVs: SCD dates as strings, numeric tracking columns as floats"""
+    out = stringify_dates(df)
+    # Parsed numbers may be nullable integers; write them as floats ('9500.0') like the existing rows
+    for col in df.columns.intersection(NUMERIC_TRACKING_COLUMNS, sort=False):
+        out[col] = df[col].astype('Float64')
+    return out
+
+
+def save_history_csv(df, history_file):
+    """Write a history frame to CSV with its SCD date columns as strings"""
+    _history_csv_frame(df).to_csv(history_file, index=False, chunksize=CSV_WRITE_CHUNK_ROWS)
+
+
+def save_excel(df, excel_filename):
+    """Stream a frame to .xlsx row by row with xlsxwriter in constant-memory mode"""
+    workbook = xlsxwriter.Workbook(excel_filename, {
+        'constant_memory': True,
+        'nan_inf_to_errors': True,
+        'strings_to_urls': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    worksheet = workbook.add_worksheet()
+    worksheet.write_row(0, 0, [str(col) for col in df.columns], workbook.add_format({'bold': True, 'border': 1}))
+
+    # Constant-memory mode flushes each row once the next one starts, so cells must be written row by
+    # row (pandas' ExcelWriter writes column by column). Missing values become empty cells
+    rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+    for row_idx, values in enumerate(rows, start=1):
+        worksheet.write_row(row_idx, 0, values)
+    workbook.close()
+
+
+def save_history_incremental(merged_history, history_file, scrape_date):
+    """Append rows closed before today to the archive and rewrite only the rest of the history CSV"""
+    today = pd.Timestamp(scrape_date.date())
+    archive_file = _archive_path(history_file)
+
+    # Rows closed before today never change again. Each save archives all of them, so the archive
+    # already holds every closed row up to its latest valid_to
+    valid_to = pd.to_datetime(merged_history['valid_to'].astype(str), format='ISO8601', errors='coerce')
+    closed = ~merged_history['is_latest'].astype(bool) & (valid_to < today)
+    to_archive = closed
+    if os.path.exists(archive_file):
+        archived_through = pd.to_datetime(
+            pd.read_csv(archive_file, usecols=['valid_to'])['valid_to'], format='ISO8601', errors='coerce'
+        ).max()
+        if pd.notna(archived_through):
+            to_archive = closed & (valid_to > archived_through)
+
+    if to_archive.any():
+        _history_csv_frame(merged_history[to_archive]).to_csv(
+            archive_file, mode='a', header=not os.path.exists(archive_file), index=False
+        )
+    save_history_csv(merged_history[~closed], history_file)
+    return int(to_archive.sum())
+
+
 def get_latest_records(history_df):
     """Get only the latest version of each car"""
     if history_df.empty:
         return history_df
-    return history_df[history_df['is_latest'] == True].copy()
+    # Callers only read or reassign the slice, so no defensive copy
+    return history_df[history_df['is_latest']]
+
+
+def compare_records(old_df, new_df, tracking_cols):
+    """Flag rows whose tracked columns changed between two row-aligned DataFrames"""
+    changed = np.zeros(len(old_df), dtype=bool)
+    if changed.size == 0:
+        return changed
 
+    numeric_cols = [col for col in tracking_cols if col in NUMERIC_TRACKING_COLUMNS]
+    date_cols = [col for col in tracking_cols if col in DATE_TRACKING_COLUMNS]
+    other_cols = [col for col in tracking_cols if col not in numeric_cols and col not in date_cols]
 
-def compare_records(old_record, new_record, tracking_cols):
-    """Check if any tracked columns have changed"""
-    for col in tracking_cols:
-        if col in ['price', 'kilometers', 'horse_power_kw', 'horse_power_ps', 'battery_range_km']:
-            old_val = old_record[col] if pd.notna(old_record[col]) else None
-            new_val = new_record[col] if pd.notna(new_record[col]) else None
-            if old_val != new_val:
-                return True
-        else:
-            if str(old_record[col]) != str(new_record[col]):
-                return True
-    return False
+    # Numbers: compare as float64, two missing values count as equal
+    if numeric_cols:
+        old = old_df[numeric_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        new = new_df[numeric_cols].apply(pd.to_numeric, errors='coerce').to_numpy(dtype='float64', na_value=np.nan)
+        changed |= ((old != new) & ~(np.isnan(old) & np.isnan(new))).any(axis=1)
+
+    # Dates: history stores them as text, the scrape as datetimes
+    for col in date_cols:
+        old = pd.to_datetime(old_df[col], errors='coerce', format='mixed').to_numpy()
+        new = pd.to_datetime(new_df[col], errors='coerce', format='mixed').to_numpy()
+        changed |= (old != new) & ~(np.isnat(old) & np.isnat(new))
+
+    # Everything else: compare the string form
+    if other_cols:
+        old = old_df[other_cols].astype(str).to_numpy()
+        new = new_df[other_cols].astype(str).to_numpy()
+        both_missing = old_df[other_cols].isna().to_numpy() & new_df[other_cols].isna().to_numpy()
+        changed |= ((old != new) & ~both_missing).any(axis=1)
+
+    return changed
 
 
 def merge_historical_data(current_data, history_df, scrape_date):
@@ -52,102 +178,112 @@ def merge_historical_data(current_data, history_df, scrape_date):
     today = scrape_date.date()
     today_str = today.isoformat()
 
-    latest_df = get_latest_records(history_df)
-
+    latest_df = get_latest_records(history_df).astype({'car_id': 'Int64'})
     current_data['car_id'] = current_data['car_id'].astype('Int64')
-    if not latest_df.empty:
-        latest_df['car_id'] = latest_df['car_id'].astype('Int64')
-
-    new_records = []
-    processed_ids = set()
 
     logger.info("=" * 60)
     logger.info("HISTORICAL DATA MERGE")
     logger.info("=" * 60)
 
-    for idx, row in current_data.iterrows():
-        car_id = row['car_id']
-        processed_ids.add(car_id)
-
-        old_record = latest_df[latest_df['car_id'] == car_id]
-
-        if old_record.empty:
-            # NEW CAR - just add it without SCD marking
-            logger.info(f"[NEW] Car ID {car_id}: {row['model_name']}")
-            new_row = row.to_dict()
-            new_row.update({
-                'first_seen_date': today_str,
-                'last_seen_date': today_str,
-                'valid_from': today_str,
-                'valid_to': None,
-                'is_latest': True,
-                'status': 'active',
-                'scrape_date': today_str
-            })
-            new_records.append(new_row)
-        else:
-            old_record = old_record.iloc[0]
-
-            if compare_records(old_record, row, TRACKING_COLUMNS):
-                # DATA CHANGED - apply SCD Type 2: mark old as expired, add new
-                logger.info(f"[CHANGED] Car ID {car_id}: {row['model_name']}")
-
-                old_row = history_df[
-                    (history_df['car_id'] == car_id) &
-                    (history_df['is_latest'] == True)
-                ].iloc[0].to_dict()
-                old_row['valid_to'] = today_str
-                old_row['is_latest'] = False
-                new_records.append(old_row)
-
-                new_row = row.to_dict()
-                new_row.update({
-                    'first_seen_date': old_record['first_seen_date'],
-                    'last_seen_date': today_str,
-                    'valid_from': today_str,
-                    'valid_to': None,
-                    'is_latest': True,
-                    'status': 'active',
-                    'scrape_date': today_str
-                })
-                new_records.append(new_row)
-            else:
-                # NO CHANGE - just update timestamps, keep as is_latest=True
-                logger.info(f"[UNCHANGED] Car ID {car_id}: {row['model_name']}")
-                old_row = old_record.to_dict()
-                old_row['last_seen_date'] = today_str
-                old_row['scrape_date'] = today_str
-                new_records.append(old_row)
-
-    if not latest_df.empty:
-        disappeared_cars = latest_df[
-            ~latest_df['car_id'].isin(processed_ids) &
-            (latest_df['status'] == 'active')
-        ]
-
-        for idx, old_record in disappeared_cars.iterrows():
-            car_id = old_record['car_id']
-            logger.info(f"[SOLD/REMOVED] Car ID {car_id}: {old_record['model_name']}")
-
-            old_row = old_record.to_dict()
-            old_row['valid_to'] = today_str
-            old_row['is_latest'] = False
-            old_row['status'] = 'sold'
-            new_records.append(old_row)
+    # Cars without an ID can't be matched against history: always added as new / expired as gone
+    current_has_id = current_data['car_id'].notna()
+    latest_has_id = latest_df['car_id'].notna()
+    current_keyed = current_data[current_has_id].drop_duplicates(subset=['car_id'], keep='last')
+    latest_keyed = latest_df[latest_has_id].drop_duplicates(subset=['car_id'], keep='first')
+
+    # One hash join classifies every car: right_only = new, left_only = gone, both = seen again
+    merged = latest_keyed.merge(
+        current_keyed, on='car_id', how='outer', suffixes=('_old', '_new'),
+        indicator=True, validate='one_to_one'
+    )
+    both = merged[merged['_merge'] == 'both']
+    old_cols = [col if col == 'car_id' else f'{col}_old' for col in TRACKING_COLUMNS]
+    new_cols = [col if col == 'car_id' else f'{col}_new' for col in TRACKING_COLUMNS]
+    changed = compare_records(
+        both[old_cols].set_axis(TRACKING_COLUMNS, axis=1),
+        both[new_cols].set_axis(TRACKING_COLUMNS, axis=1),
+        TRACKING_COLUMNS
+    )
+
+    new_ids = merged.loc[merged['_merge'] == 'right_only', 'car_id']
+    gone_ids = merged.loc[merged['_merge'] == 'left_only', 'car_id']
+    changed_ids = both.loc[changed, 'car_id']
+    unchanged_ids = both.loc[~changed, 'car_id']
+
+    current_scd = {
+        'last_seen_date': today_str,
+        'valid_from': today_str,
+        'valid_to': None,
+        'is_latest': True,
+        'status': 'active',
+        'scrape_date': today_str
+    }
+
+    # NEW CAR - just add it without SCD marking
+    new_cars = pd.concat([
+        current_keyed[current_keyed['car_id'].isin(new_ids)],
+        current_data[~current_has_id]
+    ]).assign(first_seen_date=today_str, **current_scd)
+
+    # DATA CHANGED - apply SCD Type 2: mark old as expired, add new
+    expired_cars = latest_keyed[latest_keyed['car_id'].isin(changed_ids)].assign(
+        valid_to=today_str,
+        is_latest=False
+    )
+    changed_cars = current_keyed[current_keyed['car_id'].isin(changed_ids)]
+    changed_cars = changed_cars.assign(
+        first_seen_date=changed_cars['car_id'].map(latest_keyed.set_index('car_id')['first_seen_date']),
+        **current_scd
+    )
+
+    # NO CHANGE - just update timestamps, keep as is_latest=True
+    unchanged_cars = latest_keyed[latest_keyed['car_id'].isin(unchanged_ids)].assign(
+        last_seen_date=today_str,
+        scrape_date=today_str
+    )
+
+    # SOLD/REMOVED - active cars that are no longer listed
+    # (ID-less rows are superseded by this run's ID-less rows when there are any)
+    gone = latest_keyed[latest_keyed['car_id'].isin(gone_ids)]
+    if current_has_id.all():
+        gone = pd.concat([gone, latest_df[~latest_has_id]])
+    sold_cars = gone[gone['status'] == 'active'].assign(
+        valid_to=today_str,
+        is_latest=False,
+        status='sold'
+    )
+
+    # Per-car lines only at DEBUG (lazy formatting); one count per category at INFO
+    for label, frame in [('NEW', new_cars), ('CHANGED', changed_cars),
+                         ('UNCHANGED', unchanged_cars), ('SOLD/REMOVED', sold_cars)]:
+        if logger.isEnabledFor(logging.DEBUG):
+            for car_id, model_name in zip(frame['car_id'], frame['model_name']):
+                logger.debug("[%s] Car ID %s: %s", label, car_id, model_name)
+        logger.info(f"[{label}] {len(frame)} cars")
+
+    new_records = [
+        frame for frame in [new_cars, expired_cars, changed_cars, unchanged_cars, sold_cars]
+        if not frame.empty
+    ]
+    # Frames are already typed, so skip concat's defensive buffer copies
+    new_records_df = pd.concat(new_records, ignore_index=True, copy=False, sort=False) \
+        if new_records else pd.DataFrame(columns=HISTORY_COLUMNS)
 
     old_history = history_df[
-        (history_df['is_latest'] == False) &
+        ~history_df['is_latest'] &
         (pd.to_datetime(history_df['valid_to']) < pd.Timestamp(today))
-    ].copy() if not history_df.empty else pd.DataFrame(columns=HISTORY_COLUMNS)
-    new_records_df = pd.DataFrame(new_records)
+    ] if not history_df.empty else pd.DataFrame(columns=HISTORY_COLUMNS)
 
     if not old_history.empty:
-        merged_history = pd.concat([old_history, new_records_df], ignore_index=True)
+        merged_history = pd.concat([old_history, new_records_df], ignore_index=True, copy=False, sort=False)
     else:
         merged_history = new_records_df
 
+    # Assigned 'active'/'sold' values come back as object; keep the column one byte per row
+    merged_history = merged_history.astype({'status': STATUS_DTYPE})
+
     logger.info("=" * 60)
-    logger.info(f"Summary: {len([r for r in new_records if r.get('is_latest')])} current cars")
+    logger.info(f"Summary: {len(new_cars) + len(changed_cars) + len(unchanged_cars)} current cars")
     logger.info(f"Total historical records: {len(merged_history)}")
     logger.info("=" * 60)
 
@@ -158,10 +294,14 @@ def load_equipment_history(equipment_file):
     """Load historical equipment data from CSV"""
     if os.path.exists(equipment_file):
         try:
-            df = pd.read_csv(equipment_file, dtype={'car_id': 'Int64'})
-            for col in ['valid_from', 'valid_to', 'scrape_date']:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
+            df = pd.read_csv(
+                equipment_file,
+                dtype={'car_id': 'Int64', 'category': 'category', 'equipment_name': 'category'},
+                parse_dates=['valid_from', 'valid_to', 'scrape_date'],
+                date_format='ISO8601',
+                na_values=['NaT'],
+            )
+            df['is_latest'] = df['is_latest'].eq(True)
             logger.info(f"Loaded {len(df)} equipment records from {equipment_file}")
             return df
         except Exception as e:
@@ -170,42 +310,24 @@ def load_equipment_history(equipment_file):
     return pd.DataFrame(columns=EQUIPMENT_COLUMNS)
 
 
-def extract_equipment_from_json(car_id, equipments_json, valid_from, valid_to, is_latest, scrape_date):
-    """Extract equipment items from JSON and create normalized records (deduplicated)"""
-    equipment_records = []
-
-    if not equipments_json:
-        return equipment_records
+def parse_equipment_json(equipments_json):
+    """Parse equipments JSON into a {category: [equipment names]} dict"""
+    if isinstance(equipments_json, dict):
+        return equipments_json
+    if not isinstance(equipments_json, str) or not equipments_json:
+        return {}
 
     try:
-        equipment_data = json.loads(equipments_json) if isinstance(equipments_json, str) else equipments_json
-
-        seen = set()  # Track seen equipment to prevent duplicates
-
-        for category, equipment_list in equipment_data.items():
-            if equipment_list:
-                for equipment_name in equipment_list:
-                    # Create unique key to prevent duplicates within same car
-                    unique_key = (category, equipment_name)
-
-                    # Skip if already seen for this car
-                    if unique_key in seen:
-                        continue
-                    seen.add(unique_key)
-
-                    equipment_records.append({
-                        'car_id': car_id,
-                        'category': category,
-                        'equipment_name': equipment_name,
-                        'valid_from': valid_from,
-                        'valid_to': valid_to,
-                        'is_latest': is_latest,
-                        'scrape_date': scrape_date
-                    })
+        return orjson.loads(equipments_json)
     except Exception as e:
-        logger.warning(f"Error parsing equipment JSON for car {car_id}: {e}")
+        logger.warning(f"Error parsing equipment JSON: {e}")
+        return {}
+
 
-    return equipment_records
+def _format_dates(values, default):
+    """Format a date-like column as YYYY-MM-DD strings, falling back to default when missing"""
+    dates = pd.to_datetime(values, errors='coerce', format='ISO8601')
+    return dates.dt.strftime('%Y-%m-%d').astype(object).where(dates.notna(), default)
 
 
 def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
@@ -213,56 +335,44 @@ def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
     today = scrape_date.date()
     today_str = today.isoformat()
 
-    latest_cars = get_latest_records(car_history_df)
-    new_equipment_records = []
+    latest_cars = get_latest_records(car_history_df).dropna(subset=['car_id'])
 
     logger.info("=" * 60)
     logger.info("PROCESSING EQUIPMENT DATA...")
     logger.info("=" * 60)
 
-    for idx, car_row in latest_cars.iterrows():
-        try:
-            car_id = car_row['car_id']
-            if pd.isna(car_id):
-                continue
-
-            equipments_json = car_row.get('equipments')
-            valid_from = car_row.get('valid_from')
-            valid_to = car_row.get('valid_to')
-            is_latest = car_row.get('is_latest', True)
-            scrape_date_str = car_row.get('scrape_date')
-
-            if pd.notna(valid_from):
-                valid_from = valid_from.isoformat() if hasattr(valid_from, 'isoformat') else str(valid_from)
-            else:
-                valid_from = today_str
-
-            if pd.notna(valid_to):
-                valid_to = valid_to.isoformat() if hasattr(valid_to, 'isoformat') else str(valid_to)
-            else:
-                valid_to = None
-
-            if pd.notna(scrape_date_str):
-                scrape_date_str = scrape_date_str.isoformat() if hasattr(scrape_date_str, 'isoformat') else str(scrape_date_str)
-            else:
-                scrape_date_str = today_str
-
-            equipment_items = extract_equipment_from_json(
-                car_id, equipments_json, valid_from, valid_to, is_latest, scrape_date_str
-            )
-            if equipment_items:
-                new_equipment_records.extend(equipment_items)
-        except Exception as e:
-            logger.warning(f"      Error processing equipment for car row {idx}: {e}")
-            continue
-
-    new_equipment_df = pd.DataFrame(new_equipment_records)
+    if latest_cars.empty:
+        latest_cars = pd.DataFrame(columns=['car_id', 'equipments', 'valid_from', 'valid_to', 'is_latest', 'scrape_date'])
+
+    # Parse each distinct equipments string once; cars with the same options share the result
+    items_by_json = {
+        equipments_json: list(parse_equipment_json(equipments_json).items())
+        for equipments_json in latest_cars['equipments'].dropna().unique()
+    }
+
+    # One row per car with its (category, items) pairs, then explode twice to
+    # get one row per (car, category, equipment) without a Python loop per item
+    cars = pd.DataFrame({
+        'car_id': latest_cars['car_id'],
+        'valid_from': _format_dates(latest_cars['valid_from'], today_str),
+        'valid_to': _format_dates(latest_cars['valid_to'], None),
+        'is_latest': latest_cars['is_latest'],
+        'scrape_date': _format_dates(latest_cars['scrape_date'], today_str),
+        'items': latest_cars['equipments'].map(lambda v: items_by_json.get(v, []))
+    })
+
+    new_equipment_df = cars.explode('items').dropna(subset=['items'])
+    new_equipment_df = new_equipment_df.assign(
+        category=new_equipment_df['items'].str[0],
+        equipment_name=new_equipment_df['items'].str[1]
+    ).explode('equipment_name').dropna(subset=['equipment_name'])
+    new_equipment_df = new_equipment_df[EQUIPMENT_COLUMNS].reset_index(drop=True)
 
     if new_equipment_df.empty:
         logger.info("      No equipment records to process")
         return equipment_history_df if not equipment_history_df.empty else pd.DataFrame(columns=EQUIPMENT_COLUMNS)
 
-    # Deduplicate new equipment records by (car_id, category, equipment_name, is_latest)
+    # Deduplicate new equipment records by (car_id, category, equipment_name)
     # Keep the last occurrence (most recent)
     new_equipment_df = new_equipment_df.drop_duplicates(
         subset=['car_id', 'category', 'equipment_name'],
@@ -270,11 +380,11 @@ def merge_equipment_history(car_history_df, equipment_history_df, scrape_date):
     )
 
     if not equipment_history_df.empty:
-        merged_equipment = pd.concat([equipment_history_df, new_equipment_df], ignore_index=True)
+        merged_equipment = pd.concat([equipment_history_df, new_equipment_df], ignore_index=True, copy=False, sort=False)
     else:
         merged_equipment = new_equipment_df
 
-    logger.info(f"      Processed equipment for {len(new_equipment_df['car_id'].unique())} cars")
+    logger.info(f"      Processed equipment for {new_equipment_df['car_id'].nunique()} cars")
     logger.info(f"      Total equipment records: {len(merged_equipment)}")
     logger.info("=" * 60)
 
@@ -285,10 +395,14 @@ def load_scores_history(scores_file):
     """Load historical scores data from CSV"""
     if os.path.exists(scores_file):
         try:
-            df = pd.read_csv(scores_file, dtype={'car_id': 'Int64'})
-            for col in ['valid_from', 'valid_to', 'scrape_date']:
-                if col in df.columns:
-                    df[col] = pd.to_datetime(df[col], errors='coerce')
+            df = pd.read_csv(
+                scores_file,
+                dtype={'car_id': 'Int64'},
+                parse_dates=['valid_from', 'valid_to', 'scrape_date'],
+                date_format='ISO8601',
+                na_values=['NaT'],
+            )
+            df['is_latest'] = df['is_latest'].eq(True)
             logger.info(f"Loaded {len(df)} scores records from {scores_file}")
             return df
         except Exception as e:
@@ -302,64 +416,25 @@ def merge_scores_history(car_history_df, scores_history_df, scrape_date):
     today = scrape_date.date()
     today_str = today.isoformat()
 
-    latest_cars = get_latest_records(car_history_df)
-    new_scores_records = []
+    latest_cars = get_latest_records(car_history_df).dropna(subset=['car_id'])
 
     logger.info("=" * 60)
     logger.info("PROCESSING SCORES DATA...")
     logger.info("=" * 60)
 
-    for idx, car_row in latest_cars.iterrows():
-        try:
-            car_id = car_row['car_id']
-            if pd.isna(car_id):
-                continue
-
-            value_efficiency_score = car_row.get('value_efficiency_score')
-            age_usage_score = car_row.get('age_usage_score')
-            performance_range_score = car_row.get('performance_range_score')
-            equipment_score = car_row.get('equipment_score')
-            final_score = car_row.get('final_score')
-            valid_from = car_row.get('valid_from')
-            valid_to = car_row.get('valid_to')
-            is_latest = car_row.get('is_latest', True)
-            scrape_date_str = car_row.get('scrape_date')
-
-            if pd.notna(valid_from):
-                valid_from = valid_from.isoformat() if hasattr(valid_from, 'isoformat') else str(valid_from)
-            else:
-                valid_from = today_str
-
-            if pd.notna(valid_to):
-                valid_to = valid_to.isoformat() if hasattr(valid_to, 'isoformat') else str(valid_to)
-            else:
-                valid_to = None
-
-            if pd.notna(scrape_date_str):
-                scrape_date_str = scrape_date_str.isoformat() if hasattr(scrape_date_str, 'isoformat') else str(scrape_date_str)
-            else:
-                scrape_date_str = today_str
-
-            if pd.notna(value_efficiency_score) or pd.notna(age_usage_score) or \
-               pd.notna(performance_range_score) or pd.notna(equipment_score) or pd.notna(final_score):
-                score_record = {
-                    'car_id': car_id,
-                    'value_efficiency_score': value_efficiency_score if pd.notna(value_efficiency_score) else None,
-                    'age_usage_score': age_usage_score if pd.notna(age_usage_score) else None,
-                    'performance_range_score': performance_range_score if pd.notna(performance_range_score) else None,
-                    'equipment_score': equipment_score if pd.notna(equipment_score) else None,
-                    'final_score': final_score if pd.notna(final_score) else None,
-                    'valid_from': valid_from,
-                    'valid_to': valid_to,
-                    'is_latest': is_latest,
-                    'scrape_date': scrape_date_str
-                }
-                new_scores_records.append(score_record)
-        except Exception as e:
-            logger.warning(f"      Error processing scores for car row {idx}: {e}")
-            continue
-
-    new_scores_df = pd.DataFrame(new_scores_records)
+    # Cars with at least one score get a record; one mask instead of a check per row
+    rows = latest_cars.reindex(columns=SCORES_COLUMNS)
+    score_value_cols = ['value_efficiency_score', 'age_usage_score', 'performance_range_score',
+                        'equipment_score', 'final_score']
+    has_score = rows[score_value_cols].notna().any(axis=1)
+    rows = rows[has_score]
+    # Scores are stored as float64, as the history file always has, whatever dtype the scorer used
+    rows = rows.astype({col: 'float64' for col in score_value_cols})
+    new_scores_df = rows.assign(
+        valid_from=_format_dates(rows['valid_from'], today_str),
+        valid_to=_format_dates(rows['valid_to'], None),
+        scrape_date=_format_dates(rows['scrape_date'], today_str)
+    ).reset_index(drop=True)
 
     if new_scores_df.empty:
         logger.info("      No scores records to process")
@@ -372,11 +447,11 @@ def merge_scores_history(car_history_df, scores_history_df, scrape_date):
     )
 
     if not scores_history_df.empty:
-        merged_scores = pd.concat([scores_history_df, new_scores_df], ignore_index=True)
+        merged_scores = pd.concat([scores_history_df, new_scores_df], ignore_index=True, copy=False, sort=False)
     else:
         merged_scores = new_scores_df
 
-    logger.info(f"      Processed scores for {len(new_scores_df['car_id'].unique())} cars")
+    logger.info(f"      Processed scores for {len(new_scores_df)} cars")
     logger.info(f"      Total scores records: {len(merged_scores)}")
     logger.info("=" * 60)
 
@@ -397,17 +472,19 @@ def export_equipment_list(equipment_history_df, output_dir):
         categories = equipment_history_df['category'].dropna().unique().tolist()
         categories = sorted([str(cat) for cat in categories])
 
-        equipment_list = {}
-
-        for category in categories:
-            category_equipment = equipment_history_df[
-                equipment_history_df['category'] == category
-            ]['equipment_name'].dropna().unique().tolist()
-
-            category_equipment = sorted(list(set([str(item) for item in category_equipment])))
-
-            if category_equipment:
-                equipment_list[category] = category_equipment
+        # One groupby pass instead of re-filtering the whole table per category
+        equipment_by_category = (
+            equipment_history_df
+            .dropna(subset=['category', 'equipment_name'])
+            .astype({'category': str, 'equipment_name': str})
+            .groupby('category', sort=True)['equipment_name']
+            .unique()
+        )
+        equipment_list = {
+            category: sorted(set(items.tolist()))
+            for category, items in equipment_by_category.items()
+            if len(items)
+        }
 
         total_categories = len(equipment_list)
         total_equipment_items = sum(len(items) for items in equipment_list.values())
@@ -423,8 +500,8 @@ def export_equipment_list(equipment_history_df, output_dir):
         }
 
         equipment_list_file = f"{output_dir}/equipment_list.json"
-        with open(equipment_list_file, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+        with open(equipment_list_file, 'wb') as f:
+            f.write(orjson.dumps(output_data, option=orjson.OPT_INDENT_2))
 
         logger.info(f"      ✓ Equipment list exported: {equipment_list_file}")
         logger.info(f"      ✓ Total categories: {total_categories}")
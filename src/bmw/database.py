@@ -38,7 +38,7 @@ class SupabaseClient:
             logger.info("=" * 60)
 
             latest_records = merged_history_df[
-                merged_history_df['is_latest'] == True
+                merged_history_df['is_latest']
             ].copy()
 
             if latest_records.empty:
@@ -70,7 +70,7 @@ class SupabaseClient:
                     'first_seen_date': first_seen,
                     'last_seen_date': last_seen,
                     'current_status': row.get('status', 'active'),
-                    'link': row.get('link')
+                    'link': self._parse_str(row.get('link'))
                 }
 
                 if car_data['car_id'] is None:
@@ -157,7 +157,7 @@ class SupabaseClient:
 
                 history_data = {
                     'car_id': int(row['car_id']) if pd.notna(row['car_id']) else None,
-                    'model_name': row.get('model_name'),
+                    'model_name': self._parse_str(row.get('model_name')),
                     'price': self._parse_numeric(row.get('price')),
                     'kilometers': self._parse_int(row.get('kilometers')),
                     'registration_date': self._parse_date(row.get('registration_date')),
@@ -171,7 +171,7 @@ class SupabaseClient:
                     'valid_to': self._parse_date(row.get('valid_to')),
                     'is_latest': bool(row.get('is_latest', True)),
                     'status': row.get('status', 'active'),
-                    'link': row.get('link'),
+                    'link': self._parse_str(row.get('link')),
                     'scrape_date': scrape_date
                 }
 
@@ -575,6 +575,13 @@ class SupabaseClient:
         except (ValueError, TypeError):
             return None
 
+    @staticmethod
+    def _parse_str(value) -> Optional[str]:
+        """Parse string value (pd.NA / NaN become None)"""
+        if value is None or pd.isna(value):
+            return None
+        return str(value)
+
     @staticmethod
     def _parse_json(value) -> Optional[dict]:
         """Parse JSON value"""
@@ -12,7 +12,7 @@ import pandas as pd
 
 from src.utils.notify import Pushover
 
-from .config import OUTPUT_DIR, PREFERENCES_FILE, TRACKING_COLUMNS
+from .config import CAR_DATA_SCHEMA, LOG_LEVEL, OUTPUT_DIR, PREFERENCES_FILE, TRACKING_COLUMNS
 from .data_processor import (
     export_equipment_list,
     get_latest_records,
@@ -22,19 +22,55 @@ from .data_processor import (
     merge_equipment_history,
     merge_historical_data,
     merge_scores_history,
+    prepare_excel_export,
+    save_excel,
+    save_history_csv,
+    save_history_incremental,
 )
 from .database import SupabaseClient
-from .scorer import calculate_all_scores
+from .parser import (
+    parse_battery_range_series,
+    parse_horse_power_series,
+    parse_kilometers_series,
+    parse_price_series,
+    parse_registration_series,
+)
+from .scorer import calculate_all_scores, load_preferences
 from .scraper import scrape_bmw_inventory
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=LOG_LEVEL,
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
+SCORE_METRIC_COLUMNS = ['car_id', 'value_efficiency_score', 'age_usage_score',
+                        'performance_range_score', 'equipment_score', 'final_score']
+
+
+def _process_equipment(latest_history, equipment_file, scrape_date):
+    """Load equipment history and merge in the equipment of the latest cars"""
+    equipment_history_df = load_equipment_history(equipment_file)
+    return merge_equipment_history(latest_history, equipment_history_df, scrape_date)
+
+
+def _process_scores(df, latest_history, scores_file, scrape_date):
+    """Load scores history and merge in the scores of the latest cars"""
+    scores_history_df = load_scores_history(scores_file)
+
+    # Merge scores with history for processing
+    if all(col in df.columns for col in SCORE_METRIC_COLUMNS):
+        df_scores = df[SCORE_METRIC_COLUMNS].dropna(subset=['car_id']).drop_duplicates(subset=['car_id'], keep='last')
+        latest_history_with_scores = latest_history.merge(
+            df_scores, on='car_id', how='left', validate='many_to_one'
+        )
+    else:
+        latest_history_with_scores = latest_history
+
+    return merge_scores_history(latest_history_with_scores, scores_history_df, scrape_date)
+
 
 def main(url: str = None, test_limit: int = None, sync_db: bool = False):
     """
@@ -95,7 +131,19 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
     # ============================================================
     logger.info("\n[STEP 2/6] Processing and scoring data...")
     try:
-        df = pd.DataFrame(all_cars_data)
+        # Build the DataFrame column by column with explicit dtypes to skip
+        # pandas' per-row type inference over the list of dicts
+        df = pd.DataFrame({
+            col: pd.array([car.get(col) for car in all_cars_data], dtype=dtype)
+            for col, dtype in CAR_DATA_SCHEMA.items()
+        })
+
+        # Parse the raw text columns in one pass each instead of once per scraped car
+        df['price'] = parse_price_series(df['price_raw'])
+        df['kilometers'] = parse_kilometers_series(df['kilometers_raw'])
+        df['registration_date'] = parse_registration_series(df['registration_date_raw'])
+        df['horse_power_kw'], df['horse_power_ps'] = parse_horse_power_series(df['horse_power_raw'])
+        df['battery_range_km'] = parse_battery_range_series(df['battery_range_raw'])
 
         # Handle empty DataFrame (no cars found)
         if df.empty:
@@ -106,20 +154,9 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
             notifier.notify_scraping_complete(stats)
             return
 
-        # Reorder columns
-        column_order = [
-            'model_name', 'car_id', 'price', 'price_raw',
-            'kilometers', 'kilometers_raw',
-            'registration_date', 'registration_date_raw',
-            'horse_power_kw', 'horse_power_ps', 'horse_power_raw',
-            'battery_range_km', 'battery_range_raw',
-            'equipments', 'link'
-        ]
-        existing_columns = [col for col in column_order if col in df.columns]
-        df = df[existing_columns]
-
-        # Calculate scoring metrics
-        df = calculate_all_scores(df, preferences_file=PREFERENCES_FILE)
+        # Calculate scoring metrics; preferences are parsed once into a frozenset for membership tests
+        desired_equipment = load_preferences(PREFERENCES_FILE)
+        df = calculate_all_scores(df, desired_equipment=desired_equipment)
         logger.info(f"✓ Processed {len(df)} cars with scoring metrics")
     except Exception as e:
         error_msg = f"Error during data processing: {e}"
@@ -142,19 +179,18 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
 
         # Prepare tracking data
         tracking_cols_with_link = TRACKING_COLUMNS + ['link']
-        df_tracking = df[tracking_cols_with_link].copy()
+        # .loc returns a new frame the merge may modify, so no extra .copy() is needed
+        df_tracking = df.loc[:, tracking_cols_with_link]
 
         # Merge with history
         merged_history = merge_historical_data(df_tracking, history_df, scrape_date)
 
-        # Save to CSV
-        df_history_export = merged_history.copy()
-        for col in ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']:
-            if col in df_history_export.columns:
-                df_history_export[col] = df_history_export[col].astype(str)
+        # Index by car_id (column kept for merges/exports) so later lookups hit the index
+        merged_history = merged_history.set_index('car_id', drop=False).rename_axis(None).sort_index()
 
-        df_history_export.to_csv(history_file, index=False)
-        logger.info(f"✓ Saved {len(merged_history)} historical records to {history_file}")
+        # Save to CSV; rows closed before today are only appended to the archive
+        archived = save_history_incremental(merged_history, history_file, scrape_date)
+        logger.info(f"✓ Saved {len(merged_history)} historical records to {history_file} ({archived} newly archived)")
     except Exception as e:
         error_msg = f"Error during historical data merge: {e}"
         logger.error(f"✗ {error_msg}")
@@ -163,21 +199,20 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
         notifier.notify_scraping_complete(stats)
         return
 
+    # Filter the current version of each car once; equipment, scores and the export all use it
+    latest_history = get_latest_records(merged_history)
+
+    equipment_file = f"{OUTPUT_DIR}/bmw_cars_equipment_history.csv"
+    scores_file = f"{OUTPUT_DIR}/bmw_cars_scores_history.csv"
+
     # ============================================================
     # STEP 4: EQUIPMENT TRACKING
     # ============================================================
     logger.info("\n[STEP 4/6] Processing equipment data...")
     try:
-        equipment_file = f"{OUTPUT_DIR}/bmw_cars_equipment_history.csv"
-        equipment_history_df = load_equipment_history(equipment_file)
-        merged_equipment = merge_equipment_history(merged_history, equipment_history_df, scrape_date)
-
-        df_equipment_export = merged_equipment.copy()
-        for col in ['valid_from', 'valid_to', 'scrape_date']:
-            if col in df_equipment_export.columns:
-                df_equipment_export[col] = df_equipment_export[col].astype(str)
+        merged_equipment = _process_equipment(latest_history, equipment_file, scrape_date)
 
-        df_equipment_export.to_csv(equipment_file, index=False)
+        save_history_csv(merged_equipment, equipment_file)
         logger.info(f"✓ Saved {len(merged_equipment)} equipment records to {equipment_file}")
 
         # Export equipment list
@@ -195,26 +230,9 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
     # ============================================================
     logger.info("\n[STEP 5/6] Processing scores data...")
     try:
-        scores_file = f"{OUTPUT_DIR}/bmw_cars_scores_history.csv"
-        scores_history_df = load_scores_history(scores_file)
-
-        # Merge scores with history for processing
-        score_cols = ['car_id', 'value_efficiency_score', 'age_usage_score',
-                      'performance_range_score', 'equipment_score', 'final_score']
-        if all(col in df.columns for col in score_cols):
-            df_scores = df[score_cols].copy()
-            merged_history_with_scores = merged_history.merge(df_scores, on='car_id', how='left')
-        else:
-            merged_history_with_scores = merged_history
-
-        merged_scores = merge_scores_history(merged_history_with_scores, scores_history_df, scrape_date)
-
-        df_scores_export = merged_scores.copy()
-        for col in ['valid_from', 'valid_to', 'scrape_date']:
-            if col in df_scores_export.columns:
-                df_scores_export[col] = df_scores_export[col].astype(str)
-
-        df_scores_export.to_csv(scores_file, index=False)
+        merged_scores = _process_scores(df, latest_history, scores_file, scrape_date)
+
+        save_history_csv(merged_scores, scores_file)
         logger.info(f"✓ Saved {len(merged_scores)} scores records to {scores_file}")
     except Exception as e:
         error_msg = f"Error during scores processing: {e}"
@@ -230,14 +248,13 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
     logger.info("\n[STEP 6/6] Exporting data...")
     try:
         # Get latest records for current state
-        latest_records = get_latest_records(merged_history)
+        latest_records = latest_history
 
         # Join scores
         latest_scores = get_latest_records(merged_scores)
         if not latest_scores.empty:
             latest_records = latest_records.merge(
-                latest_scores[['car_id', 'value_efficiency_score', 'age_usage_score',
-                              'performance_range_score', 'equipment_score', 'final_score']],
+                latest_scores[SCORE_METRIC_COLUMNS],
                 on='car_id',
                 how='left'
             )
@@ -246,12 +263,9 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
         date_str = datetime.now().strftime("%Y-%m-%d")
         excel_filename = f"{OUTPUT_DIR}/bmw_cars_{date_str}.xlsx"
 
-        df_export = latest_records.copy()
-        for col in ['first_seen_date', 'last_seen_date', 'valid_from', 'valid_to', 'scrape_date']:
-            if col in df_export.columns:
-                df_export[col] = df_export[col].astype(str)
+        df_export = prepare_excel_export(latest_records)
 
-        df_export.to_excel(excel_filename, index=False, engine='openpyxl')
+        save_excel(df_export, excel_filename)
         logger.info(f"✓ Exported Excel file: {excel_filename}")
 
         # Summary
@@ -259,9 +273,9 @@ def main(url: str = None, test_limit: int = None, sync_db: bool = False):
         logger.info("=" * 60)
         logger.info("INVENTORY SUMMARY")
         logger.info("=" * 60)
-        active_cars = len(df_export[df_export['status'] == 'active'])
-        sold_cars = len(df_export[df_export['status'] == 'sold'])
-        total_unique_cars = len(merged_history['car_id'].unique())
+        active_cars = int(df_export['status'].eq('active').sum())
+        sold_cars = int(df_export['status'].eq('sold').sum())
+        total_unique_cars = merged_history.index.nunique()
 
         # Update statistics
         stats["active_cars"] = active_cars
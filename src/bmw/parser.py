@@ -1,38 +1,20 @@
 import logging
 import re
-from datetime import datetime
+
+import pandas as pd
 
 from .config import FRENCH_MONTHS
 
 logger = logging.getLogger(__name__)
 
-
-def parse_price(price_str):
-    """Convert price string like '59 950,00 €' to float like 59950.0"""
-    if not price_str:
-        return None
-    try:
-        cleaned = price_str.replace('€', '').strip()
-        cleaned = re.sub(r'\s+', '', cleaned)
-        cleaned = cleaned.replace(',', '.')
-        cleaned = re.sub(r'[^\d\.\-]', '', cleaned)
-        return float(cleaned)
-    except Exception as e:
-        logger.warning(f"Error parsing price: {e}")
-        return None
-
-
-def parse_kilometers(km_str):
-    """Convert kilometers string like '9500 km' to integer like 9500"""
-    if not km_str:
-        return None
-    try:
-        numbers = re.findall(r'\d+', km_str.replace(' ', ''))
-        if numbers:
-            return int(numbers[0])
-    except Exception as e:
-        logger.warning(f"Error parsing kilometers: {e}")
-    return None
+# Compiled once at import and shared by the parse_* helpers
+_WS_RE = re.compile(r'\s+')
+_NONNUM = re.compile(r'[^\d\.\-]')
+_DIGITS_GROUP = re.compile(r'(\d+)')
+_KW_RE = re.compile(r'(\d+)\s*kW')
+_PS_RE = re.compile(r'\((\d+)\s*PS\)')
+# Month word and year of strings like 'août 2025'; trailing words are ignored
+_REG_DATE_RE = re.compile(r'^\s*(\S+)\s+([+-]?\d+)(?!\S)')
 
 
 def parse_car_id(car_id_str):
@@ -46,48 +28,40 @@ def parse_car_id(car_id_str):
         return None
 
 
-def parse_horse_power(power_str):
-    """Extract kW and PS from power string like '210 kW (286 PS)'"""
-    if not power_str:
-        return None, None
-    try:
-        kw_match = re.search(r'(\d+)\s*kW', power_str)
-        kw = int(kw_match.group(1)) if kw_match else None
-        ps_match = re.search(r'\((\d+)\s*PS\)', power_str)
-        ps = int(ps_match.group(1)) if ps_match else None
-        return kw, ps
-    except Exception as e:
-        logger.warning(f"Error parsing horse power: {e}")
-        return None, None
+def parse_registration_series(date_series):
+    """Convert a Series of French date strings like 'août 2025' to datetimes, NaT where unparseable"""
+    parts = date_series.astype('string').str.lower().str.extract(_REG_DATE_RE)
+    months = parts[0].map(FRENCH_MONTHS).astype('float64')
+    years = pd.to_numeric(parts[1], errors='coerce').astype('float64')
+    return pd.to_datetime(pd.DataFrame({'year': years, 'month': months, 'day': 1}), errors='coerce')
 
 
-def parse_battery_range(range_str):
-    """Extract battery range from string like '475 km' to integer like 475"""
-    if not range_str:
-        return None
-    try:
-        numbers = re.findall(r'\d+', range_str.replace(' ', ''))
-        if numbers:
-            return int(numbers[0])
-    except Exception as e:
-        logger.warning(f"Error parsing battery range: {e}")
-    return None
+def _first_number_series(text_series):
+    """First integer of each string with whitespace removed, <NA> where there is none"""
+    compact = text_series.astype('string').str.replace(_WS_RE, '', regex=True)
+    return compact.str.extract(_DIGITS_GROUP, expand=False).astype('Int64')
 
 
-def parse_registration_date(date_str):
-    """Convert French date string like 'août 2025' to datetime object"""
-    if not date_str:
-        return None
+def parse_kilometers_series(km_series):
+    """Convert a Series of kilometers strings like '9500 km' to integers"""
+    return _first_number_series(km_series)
 
-    try:
-        parts = date_str.strip().lower().split()
-        if len(parts) >= 2:
-            month_name = parts[0]
-            year = int(parts[1])
-
-            if month_name in FRENCH_MONTHS:
-                month = FRENCH_MONTHS[month_name]
-                return datetime(year, month, 1)
-    except Exception as e:
-        logger.warning(f"Error parsing registration date: {e}")
-    return None
+
+def parse_battery_range_series(range_series):
+    """Extract battery ranges from a Series of strings like '475 km' as integers"""
+    return _first_number_series(range_series)
+
+
+def parse_price_series(price_series):
+    """Convert a Series of price strings like '59 950,00 €' to floats"""
+    cleaned = price_series.astype('string').str.replace('€', '', regex=False).str.replace(_WS_RE, '', regex=True)
+    cleaned = cleaned.str.replace(',', '.', regex=False).str.replace(_NONNUM, '', regex=True)
+    return pd.to_numeric(cleaned, errors='coerce').astype('Float64')
+
+
+def parse_horse_power_series(power_series):
+    """Extract kW and PS from a Series of power strings like '210 kW (286 PS)', returns (kW, PS) Series"""
+    power_series = power_series.astype('string')
+    kw = power_series.str.extract(_KW_RE, expand=False).astype('Int64')
+    ps = power_series.str.extract(_PS_RE, expand=False).astype('Int64')
+    return kw, ps
@@ -1,34 +1,54 @@
-import json
 import logging
+import os
 from datetime import datetime
+from functools import lru_cache
 
+import numpy as np
+import orjson
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Adequacy step functions: below the first threshold scores 20, at or above the last scores 100
+RANGE_ADEQUACY_THRESHOLDS = np.array([300, 350, 400, 450, 500])
+POWER_ADEQUACY_THRESHOLDS = np.array([100, 150, 200, 250, 300])
+ADEQUACY_SCORES = np.array([20, 40, 60, 80, 90, 100], dtype='float64')
+
+# Performance/range score: 40% range adequacy, 30% power adequacy, 30% range efficiency
+PERFORMANCE_RANGE_WEIGHTS = np.array([0.4, 0.3, 0.3])
+
+# Final score: equal 25% weight per category score
+FINAL_SCORE_COLUMNS = ['value_efficiency_score', 'age_usage_score', 'performance_range_score', 'equipment_score']
+FINAL_SCORE_WEIGHTS = np.array([0.25, 0.25, 0.25, 0.25])
+
+
+@lru_cache(maxsize=32)
+def _load_desired_equipment(preferences_file, mtime):
+    """Read desired equipment from the preferences file, cached per path and modification time"""
+    with open(preferences_file, 'rb') as f:
+        return frozenset(orjson.loads(f.read()).get('desired_equipment', []))
+
 
 def load_preferences(preferences_file):
-    """Load desired equipment preferences from JSON file"""
+    """Load desired equipment preferences from JSON file as a frozenset"""
     try:
-        with open(preferences_file, 'r', encoding='utf-8') as f:
-            preferences_data = json.load(f)
-            desired_equipment = preferences_data.get('desired_equipment', [])
-            logger.info(f"      ✓ Loaded {len(desired_equipment)} desired equipment items from preferences")
-            return set(desired_equipment)
+        desired_equipment = _load_desired_equipment(preferences_file, os.path.getmtime(preferences_file))
+        logger.info(f"      ✓ Loaded {len(desired_equipment)} desired equipment items from preferences")
+        return desired_equipment
     except Exception as e:
         logger.warning(f"      ✗ Error loading preferences file: {e}")
-        return set()
+        return frozenset()
 
 
 def extract_all_equipment_items(equipments_json):
     """Extract all equipment items from JSON, flattening across all categories"""
     all_equipment = set()
 
-    if not equipments_json:
+    if not isinstance(equipments_json, (str, bytes, dict)) or not equipments_json:
         return all_equipment
 
     try:
-        equipment_data = json.loads(equipments_json) if isinstance(equipments_json, str) else equipments_json
+        equipment_data = orjson.loads(equipments_json) if isinstance(equipments_json, (str, bytes)) else equipments_json
 
         for category, equipment_list in equipment_data.items():
             if equipment_list:
@@ -53,76 +73,64 @@ def calculate_age_metrics(df):
         return df
 
     current_date = datetime.now()
+    registration = pd.to_datetime(df['registration_date'], errors='coerce')
 
-    df['age_months'] = df['registration_date'].apply(
-        lambda x: (current_date.year - x.year) * 12 + (current_date.month - x.month)
-        if pd.notna(x) else None
-    )
+    df['age_months'] = (current_date.year - registration.dt.year) * 12 + (current_date.month - registration.dt.month)
 
     df['age_years'] = df['age_months'] / 12.0
 
     # Extract car year from registration date
-    df['car_year'] = df['registration_date'].apply(
-        lambda x: x.year if pd.notna(x) else None
-    )
+    df['car_year'] = registration.dt.year
 
     return df
 
 
+def _step_score(values, thresholds, scores):
+    """Map values onto step scores: scores[i] for values at or above thresholds[i - 1], NaN when missing"""
+    values = values.to_numpy(dtype='float64', na_value=np.nan)
+    bins = np.searchsorted(thresholds, values, side='right')
+    return np.where(np.isnan(values), np.nan, scores[bins])
+
+
+def _weighted_score(df, columns, weights):
+    """Row-wise weighted sum of score columns, skipping missing ones; NaN when all are missing"""
+    block = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    return np.where(np.isnan(block).all(axis=1), np.nan, np.nansum(block * weights, axis=1))
+
+
+def _ratio(numerator, denominator):
+    """Element-wise numerator / denominator, NaN where either is missing or the denominator is not positive"""
+    denominator = denominator.astype('float64')
+    return numerator.astype('float64') / denominator.where(denominator > 0)
+
+
+def _scale_0_100(values, invert=False, flat_score=50):
+    """Min-max scale values to 0-100 (inverted: lowest = 100), flat_score everywhere when all valid values are equal"""
+    values = values.astype('float64')
+    if values.notna().sum() == 0:
+        return pd.Series(np.nan, index=values.index)
+
+    min_val = values.min()
+    max_val = values.max()
+    if max_val > min_val:
+        if invert:
+            return 100 * (1 - (values - min_val) / (max_val - min_val))
+        return 100 * (values - min_val) / (max_val - min_val)
+    return pd.Series(float(flat_score), index=values.index)
+
+
 def calculate_value_efficiency_metrics(df):
     """Calculate value efficiency metrics and scores"""
     df = df.copy()
 
-    df['price_per_kw'] = df.apply(
-        lambda row: row['price'] / row['horse_power_kw']
-        if pd.notna(row['price']) and pd.notna(row['horse_power_kw']) and row['horse_power_kw'] > 0
-        else None,
-        axis=1
-    )
+    df['price_per_kw'] = _ratio(df['price'], df['horse_power_kw'])
+    df['price_per_km_range'] = _ratio(df['price'], df['battery_range_km'])
 
-    df['price_per_km_range'] = df.apply(
-        lambda row: row['price'] / row['battery_range_km']
-        if pd.notna(row['price']) and pd.notna(row['battery_range_km']) and row['battery_range_km'] > 0
-        else None,
-        axis=1
-    )
+    # Lower price per unit = better value
+    df['value_score_price_per_kw'] = _scale_0_100(df['price_per_kw'], invert=True)
+    df['value_score_price_per_range'] = _scale_0_100(df['price_per_km_range'], invert=True)
 
-    valid_price_per_kw = df['price_per_kw'].dropna()
-    if len(valid_price_per_kw) > 0:
-        min_val = valid_price_per_kw.min()
-        max_val = valid_price_per_kw.max()
-        if max_val > min_val:
-            df['value_score_price_per_kw'] = df['price_per_kw'].apply(
-                lambda x: 100 * (1 - (x - min_val) / (max_val - min_val))
-                if pd.notna(x) else None
-            )
-        else:
-            df['value_score_price_per_kw'] = 50 if len(valid_price_per_kw) > 0 else None
-    else:
-        df['value_score_price_per_kw'] = None
-
-    valid_price_per_range = df['price_per_km_range'].dropna()
-    if len(valid_price_per_range) > 0:
-        min_val = valid_price_per_range.min()
-        max_val = valid_price_per_range.max()
-        if max_val > min_val:
-            df['value_score_price_per_range'] = df['price_per_km_range'].apply(
-                lambda x: 100 * (1 - (x - min_val) / (max_val - min_val))
-                if pd.notna(x) else None
-            )
-        else:
-            df['value_score_price_per_range'] = 50 if len(valid_price_per_range) > 0 else None
-    else:
-        df['value_score_price_per_range'] = None
-
-    df['value_efficiency_score'] = df.apply(
-        lambda row: pd.Series([
-            row['value_score_price_per_kw'],
-            row['value_score_price_per_range']
-        ]).mean() if any(pd.notna([row['value_score_price_per_kw'],
-                                   row['value_score_price_per_range']])) else None,
-        axis=1
-    )
+    df['value_efficiency_score'] = df[['value_score_price_per_kw', 'value_score_price_per_range']].mean(axis=1)
 
     return df
 
@@ -132,58 +140,20 @@ def calculate_age_usage_scores(df):
     df = df.copy()
     current_year = datetime.now().year
 
-    # Year-based score: current year = maximum (100), older years get progressively lower scores
-    def year_score(car_year):
-        if pd.isna(car_year):
-            return None
-        year_diff = current_year - car_year
-        if year_diff == 0:
-            return 100  # Current year = maximum score
-        elif year_diff == 1:
-            return 90   # Year - 1
-        elif year_diff == 2:
-            return 80   # Year - 2
-        elif year_diff == 3:
-            return 70   # Year - 3
-        elif year_diff == 4:
-            return 60   # Year - 4
-        elif year_diff == 5:
-            return 50   # Year - 5
-        else:
-            # For older cars, decrease by 5 points per additional year, minimum 0
-            return max(0, 50 - (year_diff - 5) * 5)
-
-    df['year_score'] = df['car_year'].apply(year_score)
+    # Year-based score: current year = maximum (100), -10 per year down to 50 at year - 5,
+    # then -5 per additional year, minimum 0
+    year_diff = current_year - df['car_year'].astype('float64')
+    df['year_score'] = (100 - year_diff * 10).where(
+        year_diff.between(0, 5),
+        (50 - (year_diff - 5) * 5).clip(lower=0)
+    )
 
     # Total mileage score: lower total kilometers = better score (independent of car age)
-    valid_km = df['kilometers'].dropna()
-    if len(valid_km) > 0:
-        min_km = valid_km.min()
-        max_km = valid_km.max()
-
-        def mileage_score(total_km):
-            if pd.isna(total_km):
-                return None
-            if max_km > min_km:
-                # Invert: lower km = higher score
-                # Normalize to 0-100 scale where min_km = 100 and max_km = 0
-                return 100 * (1 - (total_km - min_km) / (max_km - min_km))
-            else:
-                # All cars have same mileage
-                return 100 if len(valid_km) > 0 else None
-
-        df['mileage_score'] = df['kilometers'].apply(mileage_score)
-    else:
-        df['mileage_score'] = None
+    # min_km = 100 and max_km = 0; all cars with the same mileage score 100, unknown mileage stays NaN
+    df['mileage_score'] = _scale_0_100(df['kilometers'], invert=True, flat_score=100).where(df['kilometers'].notna())
 
     # Combine year_score and mileage_score (50% each)
-    df['age_usage_score'] = df.apply(
-        lambda row: pd.Series([
-            row['year_score'] * 0.5 if pd.notna(row['year_score']) else None,
-            row['mileage_score'] * 0.5 if pd.notna(row['mileage_score']) else None
-        ]).sum() if any(pd.notna([row['year_score'], row['mileage_score']])) else None,
-        axis=1
-    )
+    df['age_usage_score'] = df[['year_score', 'mileage_score']].astype('float64').mul(0.5).sum(axis=1, min_count=1)
 
     return df
 
@@ -192,81 +162,26 @@ def calculate_performance_range_scores(df):
     """Calculate performance and range metrics and scores"""
     df = df.copy()
 
-    df['range_efficiency'] = df.apply(
-        lambda row: row['battery_range_km'] / row['horse_power_kw']
-        if pd.notna(row['battery_range_km']) and pd.notna(row['horse_power_kw']) and row['horse_power_kw'] > 0
-        else None,
-        axis=1
-    )
+    df['range_efficiency'] = _ratio(df['battery_range_km'], df['horse_power_kw'])
 
-    def range_adequacy_score(range_km):
-        if pd.isna(range_km):
-            return None
-        if range_km >= 500:
-            return 100
-        elif range_km >= 450:
-            return 90
-        elif range_km >= 400:
-            return 80
-        elif range_km >= 350:
-            return 60
-        elif range_km >= 300:
-            return 40
-        else:
-            return 20
-
-    df['range_adequacy_score'] = df['battery_range_km'].apply(range_adequacy_score)
-
-    def power_adequacy_score(power_kw):
-        if pd.isna(power_kw):
-            return None
-        if power_kw >= 300:
-            return 100
-        elif power_kw >= 250:
-            return 90
-        elif power_kw >= 200:
-            return 80
-        elif power_kw >= 150:
-            return 60
-        elif power_kw >= 100:
-            return 40
-        else:
-            return 20
-
-    df['power_adequacy_score'] = df['horse_power_kw'].apply(power_adequacy_score)
-
-    valid_efficiency = df['range_efficiency'].dropna()
-    if len(valid_efficiency) > 0:
-        min_val = valid_efficiency.min()
-        max_val = valid_efficiency.max()
-        if max_val > min_val:
-            df['range_efficiency_score'] = df['range_efficiency'].apply(
-                lambda x: 100 * (x - min_val) / (max_val - min_val)
-                if pd.notna(x) else None
-            )
-        else:
-            df['range_efficiency_score'] = 50 if len(valid_efficiency) > 0 else None
-    else:
-        df['range_efficiency_score'] = None
-
-    df['performance_range_score'] = df.apply(
-        lambda row: pd.Series([
-            row['range_adequacy_score'] * 0.4 if pd.notna(row['range_adequacy_score']) else None,
-            row['power_adequacy_score'] * 0.3 if pd.notna(row['power_adequacy_score']) else None,
-            row['range_efficiency_score'] * 0.3 if pd.notna(row['range_efficiency_score']) else None
-        ]).sum() if any(pd.notna([row['range_adequacy_score'],
-                                  row['power_adequacy_score'],
-                                  row['range_efficiency_score']])) else None,
-        axis=1
+    df['range_adequacy_score'] = _step_score(df['battery_range_km'], RANGE_ADEQUACY_THRESHOLDS, ADEQUACY_SCORES)
+
+    df['power_adequacy_score'] = _step_score(df['horse_power_kw'], POWER_ADEQUACY_THRESHOLDS, ADEQUACY_SCORES)
+
+    df['range_efficiency_score'] = _scale_0_100(df['range_efficiency'])
+
+    df['performance_range_score'] = _weighted_score(
+        df, ['range_adequacy_score', 'power_adequacy_score', 'range_efficiency_score'], PERFORMANCE_RANGE_WEIGHTS
     )
 
     return df
 
 
-def calculate_equipment_scores(df, preferences_file):
-    """Calculate equipment scores based on desired equipment preferences"""
-    logger.info("  → Loading equipment preferences...")
-    desired_equipment = load_preferences(preferences_file)
+def calculate_equipment_scores(df, preferences_file=None, desired_equipment=None):
+    """Calculate equipment scores based on desired equipment preferences, read from the file unless already loaded"""
+    if desired_equipment is None:
+        logger.info("  → Loading equipment preferences...")
+        desired_equipment = load_preferences(preferences_file)
 
     if not desired_equipment:
         logger.warning("      ✗ No desired equipment found, equipment scores will be None")
@@ -276,62 +191,32 @@ def calculate_equipment_scores(df, preferences_file):
     logger.info("  → Calculating equipment scores...")
     df = df.copy()
 
-    equipment_scores_raw = []
-
-    for idx, row in df.iterrows():
-        try:
-            equipments_json = row.get('equipments')
-            car_equipment = extract_all_equipment_items(equipments_json)
-
-            if not car_equipment:
-                equipment_scores_raw.append(None)
-                continue
-
-            raw_score = 0
-            matched_desired = 0
-
-            for equipment in car_equipment:
-                if equipment in desired_equipment:
-                    raw_score += 2
-                    matched_desired += 1
-                else:
-                    raw_score += 1
-
-            equipment_scores_raw.append({
-                'raw_score': raw_score,
-                'matched_desired': matched_desired,
-                'total_equipment': len(car_equipment)
-            })
-        except Exception as e:
-            logger.warning(f"      Error calculating equipment score for car {idx}: {e}")
-            equipment_scores_raw.append(None)
-
-    valid_scores = [s['raw_score'] for s in equipment_scores_raw if s is not None]
-
-    if len(valid_scores) > 0:
-        min_score = min(valid_scores)
-        max_score = max(valid_scores)
-
-        if max_score > min_score:
-            normalized_scores = []
-            for score_data in equipment_scores_raw:
-                if score_data is None:
-                    normalized_scores.append(None)
-                else:
-                    normalized_score = 100 * (score_data['raw_score'] - min_score) / (max_score - min_score)
-                    normalized_scores.append(normalized_score)
-            df['equipment_score'] = normalized_scores
-        else:
-            df['equipment_score'] = 50 if len(valid_scores) > 0 else None
+    if 'equipments' in df.columns:
+        equipments = pd.Series(df['equipments'].to_numpy(dtype=object))
     else:
-        df['equipment_score'] = None
+        equipments = pd.Series([None] * len(df), dtype=object)
+
+    # Long-form (car, equipment item) table; each distinct equipments JSON is parsed once
+    items_by_json = {
+        equipments_json: list(extract_all_equipment_items(equipments_json))
+        for equipments_json in equipments.dropna().unique()
+    }
+    car_items = equipments.map(lambda v: items_by_json.get(v, [])).explode().dropna()
+    per_car = car_items.isin(desired_equipment).groupby(level=0).agg(['size', 'sum']).reindex(range(len(df)))
+
+    total_equipment = per_car['size'].fillna(0).to_numpy(dtype='float64')
+    matched_desired = per_car['sum'].fillna(0).to_numpy(dtype='float64')
+    has_equipment = total_equipment > 0
+
+    # Desired equipment counts 2 points, any other item 1; cars without equipment stay NaN
+    raw_scores = pd.Series(np.where(has_equipment, total_equipment + matched_desired, np.nan), index=df.index)
+    df['equipment_score'] = _scale_0_100(raw_scores)
 
     valid_equipment_scores = df['equipment_score'].dropna()
     if len(valid_equipment_scores) > 0:
         logger.info(f"      ✓ Equipment scores calculated - Avg: {valid_equipment_scores.mean():.1f}, Min: {valid_equipment_scores.min():.1f}, Max: {valid_equipment_scores.max():.1f}")
-        matched_counts = [s['matched_desired'] for s in equipment_scores_raw if s is not None]
-        if matched_counts:
-            logger.info(f"      ✓ Desired equipment matches - Avg: {sum(matched_counts)/len(matched_counts):.1f}/{len(desired_equipment)}")
+        if has_equipment.any():
+            logger.info(f"      ✓ Desired equipment matches - Avg: {matched_desired[has_equipment].mean():.1f}/{len(desired_equipment)}")
 
     return df
 
@@ -340,24 +225,18 @@ def calculate_final_score(df):
     """Calculate final overall score combining all category scores"""
     df = df.copy()
 
-    df['final_score'] = df.apply(
-        lambda row: pd.Series([
-            row['value_efficiency_score'] * 0.25 if pd.notna(row['value_efficiency_score']) else None,
-            row['age_usage_score'] * 0.25 if pd.notna(row['age_usage_score']) else None,
-            row['performance_range_score'] * 0.25 if pd.notna(row['performance_range_score']) else None,
-            row['equipment_score'] * 0.25 if pd.notna(row['equipment_score']) else None
-        ]).sum() if any(pd.notna([row['value_efficiency_score'],
-                                  row['age_usage_score'],
-                                  row['performance_range_score'],
-                                  row['equipment_score']])) else None,
-        axis=1
-    )
+    # Column-major block so each score column is read as one contiguous run
+    scores = np.asfortranarray(df[FINAL_SCORE_COLUMNS].to_numpy(dtype='float64', na_value=np.nan))
+
+    # Categories that are missing are skipped, all-missing stays NaN
+    weighted = np.nansum(scores * FINAL_SCORE_WEIGHTS, axis=1)
+    df['final_score'] = np.where(np.isnan(scores).all(axis=1), np.nan, weighted)
 
     return df
 
 
-def calculate_all_scores(df, preferences_file=None):
-    """Calculate all scoring metrics and add them to the DataFrame"""
+def calculate_all_scores(df, preferences_file=None, desired_equipment=None):
+    """Calculate all scoring metrics and add them to the DataFrame; desired_equipment skips reading preferences_file"""
     logger.info("=" * 60)
     logger.info("CALCULATING SCORING METRICS...")
     logger.info("=" * 60)
@@ -374,9 +253,9 @@ def calculate_all_scores(df, preferences_file=None):
     logger.info("  → Calculating performance/range scores...")
     df = calculate_performance_range_scores(df)
 
-    if preferences_file:
+    if desired_equipment is not None or preferences_file:
         logger.info("  → Calculating equipment scores...")
-        df = calculate_equipment_scores(df, preferences_file)
+        df = calculate_equipment_scores(df, preferences_file, desired_equipment)
     else:
         logger.warning("  → Skipping equipment scores (no preferences file provided)")
         df['equipment_score'] = None
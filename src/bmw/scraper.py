@@ -1,221 +1,464 @@
-import json
+import asyncio
 import logging
+import os
+from datetime import date, datetime
 
+import orjson
+from playwright.async_api import async_playwright
 from playwright.sync_api import sync_playwright
 
-from .config import BROWSER_TIMEOUT, HEADLESS_MODE
-from .parser import (
-    parse_battery_range,
-    parse_car_id,
-    parse_horse_power,
-    parse_kilometers,
-    parse_price,
-    parse_registration_date,
-)
+from .config import BROWSER_STATE_FILE, BROWSER_TIMEOUT, HEADLESS_MODE, SCRAPE_CHECKPOINT_FILE, SCRAPE_WORKERS
+from .parser import parse_car_id
 
 logger = logging.getLogger(__name__)
 
+# Requests none of the selectors need. Stylesheets stay: the extracted innerText depends on
+# CSS (text-transform, hidden nodes), so dropping it would change values against the history
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font'}
+BLOCKED_URL_PARTS = (
+    'googletagmanager', 'adobedtm', 'google-analytics', 'doubleclick.net',
+    'facebook.net', 'hotjar', 'bing.com/bat'
+)
 
-def extract_car_data(page, link):
-    """Extract all car information from a detail page"""
-    car_data = {}
-
-    # Navigate to car detail page
-    page.goto(link)
-    page.wait_for_timeout(3000)
+# Browser settings shared by the listing (sync) and detail page (async) browsers
+BROWSER_ARGS = [
+    '--disable-blink-features=AutomationControlled',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process'
+]
+BROWSER_VIEWPORT = {'width': 1920, 'height': 1080}
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Remove webdriver property to avoid detection
+HIDE_WEBDRIVER_JS = """
+    Object.defineProperty(navigator, 'webdriver', {
+        get: () => undefined
+    });
+"""
+
+# Static assets shared by all detail pages, served from memory after the first download
+CACHED_RESOURCE_TYPES = {'script', 'stylesheet'}
+# Upper bound on the asset bodies held in memory during one run; assets past it are fetched each time
+ASSET_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# Headers describing how the original body was transferred; a replayed body is already decoded
+REPLAY_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+# Links of the car cards on the results page
+MODEL_CARD_SELECTOR = 'a.model-card-link'
+
+# Cookie consent button, present on the results page and sometimes on detail pages
+COOKIE_BUTTON_NAME = "Tout accepter"
+
+# "Montrer plus" button that loads the next batch of results
+SHOW_MORE_SELECTOR = '[data-test="stolo-plp-show-more-button"]'
+
+# Fallbacks for MODEL_CARD_SELECTOR, tried in order when the results page layout differs
+CAR_LINK_SELECTORS = (
+    MODEL_CARD_SELECTOR,
+    'a[href*="/sl/stocklocator_uc/details"]',
+    'a[href*="stocklocator_uc/details"]',
+    'a[href*="/details"]',
+    '[class*="model-card"] a',
+    '[class*="vehicle-card"] a',
+    '[class*="vehicle"] a[href*="details"]',
+    '[class*="car"] a[href*="details"]',
+    '[class*="listing"] a[href*="details"]',
+    '[class*="result"] a[href*="details"]',
+    'a[href*="stocklocator"][href*="details"]',
+    'a[href*="/fr-be/sl/stocklocator_uc/details"]',
+    'a[href*="bmw.be"][href*="details"]',
+)
 
-    # Check if cookies need to be accepted
+# Detail page selectors, passed to EXTRACT_CAR_JS
+KEY_FACTS_SELECTOR = '#stock-locator__key-facts-section'
+CAR_SELECTORS = {
+    'model_name': 'h1#stock-locator__details-heading-1',
+    'car_id': 'div.vehicle-intro__vin',
+    'price': 'div.subtitle-0.price strong',
+    'key_facts': KEY_FACTS_SELECTOR,
+    'key_fact_value': 'div.value-disclaimer div.value.caption',
+    'key_fact_value_fallback': 'div.value.caption',
+    'range_label': 'div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]',
+    'range_table': 'div[class*="technical-data_table"]',
+    'range_value': 'div.headline-5 span',
+    'range_sibling': 'div[class*="headline-5"]',
+    'equipment_section': 'section.equipment-section-container',
+    'equipment_panel': 'neo-accordion-panel',
+    'equipment_header': '.content-header',
+    'equipment_category': '.header-label',
+    'equipment_card': 'div.details-card',
+    'equipment_name': 'div.headline-7.tw-mb-ng-300',
+}
+
+# Equipment panels are attached but may be collapsed, so they are waited for without visibility
+EQUIPMENT_PANEL_SELECTOR = f"{CAR_SELECTORS['equipment_section']} {CAR_SELECTORS['equipment_panel']}"
+
+# Titles of the key facts read from the detail page, by field
+KEY_FACT_TITLES = {
+    'kilometers': 'Kilomètres',
+    'registration_date': "Date d'immatriculation",
+    'horse_power': 'Power Based on Degree of Electrification',
+}
+
+# Reads every detail-page field in one evaluate call. Queries also search open shadow roots,
+# like Playwright's CSS locators do; missing fields come back as empty strings.
+EXTRACT_CAR_JS = """
+([sel, keyFactTitles]) => {
+    const queryAll = (root, selector) => {
+        const found = [...root.querySelectorAll(selector)];
+        const hosts = [...root.querySelectorAll('*')];
+        if (root.shadowRoot) hosts.push(root);
+        for (const host of hosts) {
+            if (host.shadowRoot) found.push(...queryAll(host.shadowRoot, selector));
+        }
+        return found;
+    };
+    const query = (root, selector) => (root ? queryAll(root, selector)[0] || null : null);
+    const text = (el) => (el && el.innerText ? el.innerText.trim() : '');
+
+    const keyFacts = query(document, sel.key_facts);
+    const keyFact = (title) => {
+        const fact = query(keyFacts, `div.key-fact[title="${title}"]`);
+        return text(query(fact, sel.key_fact_value)) || text(query(fact, sel.key_fact_value_fallback));
+    };
+
+    const rangeLabel = query(document, sel.range_label);
+    let batteryRange = text(query(rangeLabel && rangeLabel.closest(sel.range_table), sel.range_value));
+    for (let sibling = rangeLabel && rangeLabel.nextElementSibling; !batteryRange && sibling; sibling = sibling.nextElementSibling) {
+        if (sibling.matches(sel.range_sibling)) batteryRange = text(query(sibling, 'span'));
+    }
+
+    const equipmentPanels = [];
+    for (const section of queryAll(document, sel.equipment_section)) {
+        for (const panel of queryAll(section, sel.equipment_panel)) {
+            const category = text(query(query(panel, sel.equipment_header), sel.equipment_category));
+            const items = queryAll(panel, sel.equipment_card)
+                .map((card) => text(query(card, sel.equipment_name)))
+                .filter(Boolean);
+            equipmentPanels.push([category, items]);
+        }
+    }
+
+    const fields = {
+        model_name: text(query(document, sel.model_name)),
+        car_id: text(query(document, sel.car_id)),
+        price: text(query(document, sel.price)),
+        battery_range: batteryRange,
+        equipment_panels: equipmentPanels,
+    };
+    for (const [field, title] of Object.entries(keyFactTitles)) fields[field] = keyFact(title);
+    return fields;
+}
+"""
+
+
+async def extract_car_data(context, link):
+    """Extract all car information from a detail page, opened in its own tab of the shared context"""
+    page = await context.new_page()
     try:
-        accept_button = page.get_by_role("button", name="Tout accepter")
-        if accept_button.is_visible(timeout=2000):
-            accept_button.click()
-            page.wait_for_timeout(2000)
-    except:
-        pass  # No cookies popup, continue
+        # Navigate to car detail page and wait for the key facts, which gate the key fact fields
+        await page.goto(link, wait_until='domcontentloaded')
+        try:
+            await page.wait_for_selector(KEY_FACTS_SELECTOR, timeout=5000)
+        except Exception as e:
+            logger.warning(f"      ⚠ Key facts section not found, extracting anyway ({str(e)})")
+
+        # The technical data table and the equipment panels render separately from the key facts;
+        # both waits run together under one 5s bound, a missing field is reported by _build_car_data
+        section_waits = await asyncio.gather(
+            page.wait_for_selector(CAR_SELECTORS['range_label'], timeout=5000),
+            page.wait_for_selector(EQUIPMENT_PANEL_SELECTOR, state='attached', timeout=5000),
+            return_exceptions=True,
+        )
+        for result in section_waits:
+            if isinstance(result, Exception):
+                logger.debug(f"      → Detail section not found ({str(result)})")
+
+        # All fields in one browser round-trip instead of one per locator
+        fields = await page.evaluate(EXTRACT_CAR_JS, [CAR_SELECTORS, KEY_FACT_TITLES])
+    finally:
+        await page.close()
+
+    return _build_car_data(fields, link)
+
+
+def _dump_equipment(equipment_data):
+    """Equipment as indented JSON text, the exact text json.dumps(ensure_ascii=False, indent=2) writes"""
+    # orjson writes the same bytes about ten times faster
+    return orjson.dumps(equipment_data, option=orjson.OPT_INDENT_2).decode()
+
+
+def _build_car_data(fields, link):
+    """Turn the raw fields read from a detail page into a car record"""
+    car_data = {}
 
     # Model name
-    try:
-        model_name = page.locator('h1#stock-locator__details-heading-1').inner_text()
-        car_data['model_name'] = model_name.strip()
-        logger.info(f"      → model_name: {car_data['model_name']}")
-    except Exception as e:
+    if fields['model_name']:
+        car_data['model_name'] = fields['model_name']
+        logger.debug(f"      → model_name: {car_data['model_name']}")
+    else:
         car_data['model_name'] = None
-        logger.warning(f"      → model_name: Not found ({str(e)})")
+        logger.warning("      → model_name: Not found")
 
     # Car ID
-    try:
-        car_id_element = page.locator('div.vehicle-intro__vin')
-        car_id_text = car_id_element.inner_text()
-        car_id_raw = car_id_text.replace('CAR-ID', '').strip()
+    if fields['car_id']:
+        car_id_raw = fields['car_id'].replace('CAR-ID', '').strip()
         car_data['car_id'] = parse_car_id(car_id_raw)
-        logger.info(f"      → car_id: {car_data['car_id']} (raw: {car_id_raw})")
-    except Exception as e:
+        logger.debug(f"      → car_id: {car_data['car_id']} (raw: {car_id_raw})")
+    else:
         car_data['car_id'] = None
-        logger.warning(f"      → car_id: Not found ({str(e)})")
-
-    # Price
-    try:
-        price_element = page.locator('div.subtitle-0.price strong')
-        price_text = price_element.inner_text().strip()
-        car_data['price_raw'] = price_text
-        car_data['price'] = parse_price(price_text)
-        logger.info(f"      → price: {car_data['price']} (raw: {car_data['price_raw']})")
-    except Exception as e:
-        car_data['price_raw'] = None
-        car_data['price'] = None
-        logger.warning(f"      → price: Not found ({str(e)})")
+        logger.warning("      → car_id: Not found")
 
     # Link
     car_data['link'] = link
-    logger.info(f"      → link: {link}")
+    logger.debug(f"      → link: {link}")
+
+    # Price, kilometers, registration date, horse power and battery range are parsed once for
+    # the whole DataFrame after scraping (parse_*_series); only the raw text is kept here
+
+    # Price
+    car_data['price_raw'] = fields['price'] or None
+    if car_data['price_raw']:
+        logger.debug(f"      → price (raw): {car_data['price_raw']}")
+    else:
+        logger.warning("      → price: Not found")
 
     # Kilometers
-    try:
-        mileage_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Kilomètres"]')
-        mileage_key_fact.wait_for(state='visible', timeout=5000)
-        mileage_value = mileage_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-        if not mileage_value:
-            mileage_value = mileage_key_fact.locator('div.value.caption').inner_text().strip()
-        car_data['kilometers_raw'] = mileage_value
-        car_data['kilometers'] = parse_kilometers(mileage_value)
-        logger.info(f"      → kilometers: {car_data['kilometers']} (raw: {car_data['kilometers_raw']})")
-    except Exception as e:
-        car_data['kilometers_raw'] = None
-        car_data['kilometers'] = None
-        logger.warning(f"      → kilometers: Not found ({str(e)})")
+    car_data['kilometers_raw'] = fields['kilometers'] or None
+    if car_data['kilometers_raw']:
+        logger.debug(f"      → kilometers (raw): {car_data['kilometers_raw']}")
+    else:
+        logger.warning("      → kilometers: Not found")
 
     # Registration date
-    try:
-        registration_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Date d\'immatriculation"]')
-        registration_key_fact.wait_for(state='visible', timeout=5000)
-        registration_value = registration_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-        if not registration_value:
-            registration_value = registration_key_fact.locator('div.value.caption').inner_text().strip()
-        car_data['registration_date_raw'] = registration_value
-        car_data['registration_date'] = parse_registration_date(registration_value)
-        logger.info(f"      → registration_date: {car_data['registration_date']} (raw: {car_data['registration_date_raw']})")
-    except Exception as e:
-        car_data['registration_date_raw'] = None
-        car_data['registration_date'] = None
-        logger.warning(f"      → registration_date: Not found ({str(e)})")
+    car_data['registration_date_raw'] = fields['registration_date'] or None
+    if car_data['registration_date_raw']:
+        logger.debug(f"      → registration_date (raw): {car_data['registration_date_raw']}")
+    else:
+        logger.warning("      → registration_date: Not found")
 
     # Horse power
-    try:
-        power_key_fact = page.locator('#stock-locator__key-facts-section div.key-fact[title="Power Based on Degree of Electrification"]')
-        power_key_fact.wait_for(state='visible', timeout=5000)
-        power_value = power_key_fact.locator('div.value-disclaimer div.value.caption').inner_text().strip()
-        if not power_value:
-            power_value = power_key_fact.locator('div.value.caption').inner_text().strip()
-        car_data['horse_power_raw'] = power_value
-        kw, ps = parse_horse_power(power_value)
-        car_data['horse_power_kw'] = kw
-        car_data['horse_power_ps'] = ps
-        logger.info(f"      → horse_power_kw: {car_data['horse_power_kw']}, horse_power_ps: {car_data['horse_power_ps']} (raw: {car_data['horse_power_raw']})")
-    except Exception as e:
-        car_data['horse_power_raw'] = None
-        car_data['horse_power_kw'] = None
-        car_data['horse_power_ps'] = None
-        logger.warning(f"      → horse_power: Not found ({str(e)})")
+    car_data['horse_power_raw'] = fields['horse_power'] or None
+    if car_data['horse_power_raw']:
+        logger.debug(f"      → horse_power (raw): {car_data['horse_power_raw']}")
+    else:
+        logger.warning("      → horse_power: Not found")
 
     # Battery range
-    try:
-        battery_range_container = page.locator('div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]').locator('xpath=ancestor::div[contains(@class, "technical-data_table")]')
-        battery_range_container.wait_for(state='visible', timeout=5000)
-        battery_range_value = battery_range_container.locator('div.headline-5 span').inner_text().strip()
-        if not battery_range_value:
-            battery_range_label = page.locator('div[data-technical-data-key="wltpPureElectricRangeCombinedKilometer"]')
-            battery_range_value = battery_range_label.locator('xpath=following-sibling::div[contains(@class, "headline-5")]//span').inner_text().strip()
-        car_data['battery_range_raw'] = battery_range_value
-        car_data['battery_range_km'] = parse_battery_range(battery_range_value)
-        logger.info(f"      → battery_range_km: {car_data['battery_range_km']} (raw: {car_data['battery_range_raw']})")
-    except Exception as e:
-        car_data['battery_range_raw'] = None
-        car_data['battery_range_km'] = None
-        logger.warning(f"      → battery_range: Not found ({str(e)})")
-
-    # Extract equipment information
+    car_data['battery_range_raw'] = fields['battery_range'] or None
+    if car_data['battery_range_raw']:
+        logger.debug(f"      → battery_range (raw): {car_data['battery_range_raw']}")
+    else:
+        logger.warning("      → battery_range: Not found")
+
+    # Equipment, merging panels that repeat a category; the first panel of a category is kept
+    # as is, later ones only add items that category hasn't seen yet
     equipment_data = {}
-    try:
-        equipment_sections = page.locator('section.equipment-section-container')
-        section_count = equipment_sections.count()
+    equipment_seen = {}
+    for category_name, equipment_list in fields['equipment_panels']:
+        if category_name and equipment_list:
+            if category_name in equipment_data:
+                seen = equipment_seen[category_name]
+                for item in equipment_list:
+                    if item not in seen:
+                        seen.add(item)
+                        equipment_data[category_name].append(item)
+            else:
+                equipment_data[category_name] = list(equipment_list)
+                equipment_seen[category_name] = set(equipment_list)
+
+    car_data['equipments'] = _dump_equipment(equipment_data) if equipment_data else None
+    if car_data['equipments']:
+        equipment_count = sum(len(items) for items in equipment_data.values())
+        logger.debug(f"      → equipments: Found {len(equipment_data)} categories with {equipment_count} total items")
+    else:
+        logger.warning(f"      → equipments: Not found")
 
-        for section_idx in range(section_count):
-            try:
-                equipment_section = equipment_sections.nth(section_idx)
-                accordion_panels = equipment_section.locator('neo-accordion-panel')
-                panel_count = accordion_panels.count()
+    return car_data
 
-                for i in range(panel_count):
-                    panel = accordion_panels.nth(i)
-                    try:
-                        header = panel.locator('.content-header')
-                        category_name = header.locator('.header-label').inner_text().strip()
-                        equipment_items = panel.locator('div.details-card')
-                        item_count = equipment_items.count()
-
-                        equipment_list = []
-                        for j in range(item_count):
-                            item = equipment_items.nth(j)
-                            equipment_name = item.locator('div.headline-7.tw-mb-ng-300').inner_text().strip()
-                            if equipment_name:
-                                equipment_list.append(equipment_name)
-
-                        if category_name and equipment_list:
-                            if category_name in equipment_data:
-                                existing_items = set(equipment_data[category_name])
-                                new_items = [item for item in equipment_list if item not in existing_items]
-                                equipment_data[category_name].extend(new_items)
-                            else:
-                                equipment_data[category_name] = equipment_list
-                    except Exception as e:
-                        continue
-            except Exception as e:
-                continue
 
-        car_data['equipments'] = json.dumps(equipment_data, ensure_ascii=False, indent=2) if equipment_data else None
-        if car_data['equipments']:
-            equipment_count = sum(len(items) for items in equipment_data.values())
-            logger.info(f"      → equipments: Found {len(equipment_data)} categories with {equipment_count} total items")
+def _launch_browser(p):
+    """Launch Chromium with arguments to avoid detection"""
+    return p.chromium.launch(headless=HEADLESS_MODE, args=BROWSER_ARGS)
+
+
+def _is_blocked(request):
+    """Whether a request is an image, font or analytics call none of the selectors need"""
+    return request.resource_type in BLOCKED_RESOURCE_TYPES or any(part in request.url for part in BLOCKED_URL_PARTS)
+
+
+def _route_request(route):
+    """Abort blocked requests, let everything else through"""
+    if _is_blocked(route.request):
+        route.abort()
+    else:
+        route.continue_()
+
+
+class _AssetCache:
+    """Successful static asset responses of one run, by URL, up to max_bytes of bodies"""
+
+    def __init__(self, max_bytes=ASSET_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries = {}
+
+    def get(self, url):
+        return self._entries.get(url)
+
+    def add(self, url, headers, body):
+        """Keep a decoded body and the headers to replay it with, unless that would exceed max_bytes"""
+        if url in self._entries or self.size + len(body) > self.max_bytes:
+            return
+        replay_headers = {name: value for name, value in headers.items() if name.lower() not in REPLAY_DROPPED_HEADERS}
+        self._entries[url] = (replay_headers, body)
+        self.size += len(body)
+
+
+async def _route_request_async(route, asset_cache):
+    """Async counterpart of _route_request; static scripts and stylesheets are downloaded once per run"""
+    request = route.request
+    if _is_blocked(request):
+        await route.abort()
+    elif request.resource_type in CACHED_RESOURCE_TYPES and request.method == 'GET':
+        # Routing disables the browser HTTP cache, so replay the shared bundles from memory
+        cached = asset_cache.get(request.url)
+        if cached is not None:
+            headers, body = cached
+            await route.fulfill(status=200, headers=headers, body=body)
+            return
+        try:
+            response = await route.fetch()
+            if response.status == 200:
+                asset_cache.add(request.url, response.headers, await response.body())
+        except Exception:
+            await route.continue_()
+            return
+        # The fetched response itself keeps its headers consistent with its body, whatever the status
+        await route.fulfill(response=response)
+    else:
+        await route.continue_()
+
+
+def _new_page(browser, storage_state=None):
+    """Create a context with realistic viewport and user agent, and a page hiding the webdriver flag"""
+    context = browser.new_context(
+        viewport=BROWSER_VIEWPORT,
+        user_agent=BROWSER_USER_AGENT,
+        storage_state=storage_state
+    )
+    page = context.new_page()
+    page.route("**/*", _route_request)
+    page.add_init_script(HIDE_WEBDRIVER_JS)
+    return context, page
+
+
+def _load_checkpoint(checkpoint_file):
+    """Car records saved by an interrupted scrape earlier today, keyed by link; older checkpoints are dropped"""
+    if not os.path.exists(checkpoint_file):
+        return {}
+    if datetime.fromtimestamp(os.path.getmtime(checkpoint_file)).date() != date.today():
+        os.remove(checkpoint_file)
+        return {}
+
+    with open(checkpoint_file, 'rb') as f:
+        content = f.read()
+    records = {}
+    for line in content.splitlines():
+        try:
+            car_data = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            continue  # Last line cut off by the crash
+        records[car_data['link']] = car_data
+
+    # End a cut-off last line so the records appended next start on their own line
+    if content and not content.endswith(b'\n'):
+        with open(checkpoint_file, 'ab') as f:
+            f.write(b'\n')
+    return records
+
+
+async def _scrape_links(links, storage_state, checkpoint=None):
+    """Scrape car detail pages concurrently, at most SCRAPE_WORKERS tabs at a time in one browser context;
+    each car is appended to the checkpoint file as soon as it is extracted"""
+    total = len(links)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=HEADLESS_MODE, args=BROWSER_ARGS)
+        context = await browser.new_context(
+            viewport=BROWSER_VIEWPORT,
+            user_agent=BROWSER_USER_AGENT,
+            storage_state=storage_state
+        )
+        asset_cache = _AssetCache()
+        await context.route("**/*", lambda route: _route_request_async(route, asset_cache))
+        await context.add_init_script(HIDE_WEBDRIVER_JS)
+        semaphore = asyncio.Semaphore(SCRAPE_WORKERS)
+
+        async def bounded(idx, link):
+            async with semaphore:
+                logger.debug(f"[{idx}/{total}] Processing car {idx}: {link}")
+                car_data = await extract_car_data(context, link)
+                if checkpoint is not None:
+                    checkpoint.write(orjson.dumps(car_data) + b'\n')
+                    checkpoint.flush()
+                # One INFO line per car; the per-field details are logged at DEBUG level
+                logger.info(f"[{idx}/{total}] ✓ {car_data.get('model_name') or 'Unknown model'} - {link[:80]}")
+                return car_data
+
+        try:
+            results = await asyncio.gather(
+                *[bounded(idx, link) for idx, link in enumerate(links, 1)],
+                return_exceptions=True
+            )
+        finally:
+            await context.close()
+            await browser.close()
+
+    all_cars_data = []
+    for idx, (link, result) in enumerate(zip(links, results), 1):
+        if isinstance(result, Exception):
+            logger.error(f"      ✗ Error processing car {idx}: {str(result)}")
+            all_cars_data.append({'link': link, 'error': str(result)})
         else:
-            logger.warning(f"      → equipments: Not found")
-    except Exception as e:
-        car_data['equipments'] = None
-        logger.warning(f"      → equipments: Error extracting ({str(e)})")
+            all_cars_data.append(result)
+    return all_cars_data
 
-    return car_data
+
+def _scrape_with_checkpoint(links, storage_state):
+    """Scrape the detail pages of links, skipping cars saved by a run that died earlier today"""
+    saved_cars = _load_checkpoint(SCRAPE_CHECKPOINT_FILE)
+    pending_links = [link for link in links if link not in saved_cars]
+    if saved_cars:
+        logger.info(f"      ✓ Resuming: {len(links) - len(pending_links)} cars restored from {SCRAPE_CHECKPOINT_FILE}")
+
+    # Detail pages are network-bound, so fetch several at once
+    os.makedirs(os.path.dirname(SCRAPE_CHECKPOINT_FILE), exist_ok=True)
+    with open(SCRAPE_CHECKPOINT_FILE, 'ab') as checkpoint:
+        scraped_cars = dict(zip(pending_links, asyncio.run(_scrape_links(pending_links, storage_state, checkpoint))))
+    all_cars_data = [saved_cars.get(link) or scraped_cars[link] for link in links]
+
+    # Failed cars are kept out of the checkpoint; with none left, the next run starts fresh
+    if not any('error' in car_data for car_data in all_cars_data):
+        os.remove(SCRAPE_CHECKPOINT_FILE)
+    return all_cars_data
 
 
 def scrape_bmw_inventory(url, max_links=None):
     """Scrape BMW inventory and return list of car links and extracted data"""
-    all_cars_data = []
-
     with sync_playwright() as p:
         logger.info("[1/4] Launching browser...")
-        # Launch browser with arguments to avoid detection
-        browser = p.chromium.launch(
-            headless=HEADLESS_MODE,
-            args=[
-                '--disable-blink-features=AutomationControlled',
-                '--disable-dev-shm-usage',
-                '--no-sandbox',
-                '--disable-setuid-sandbox',
-                '--disable-web-security',
-                '--disable-features=IsolateOrigins,site-per-process'
-            ]
-        )
-        # Create context with realistic viewport and user agent
-        context = browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        page = context.new_page()
+        browser = _launch_browser(p)
+        # Reuse cookies/consent saved by a previous run, if any
+        storage_state = BROWSER_STATE_FILE if os.path.exists(BROWSER_STATE_FILE) else None
+        if storage_state:
+            logger.info(f"      ✓ Reusing saved browser state: {storage_state}")
 
-        # Remove webdriver property to avoid detection
-        page.add_init_script("""
-            Object.defineProperty(navigator, 'webdriver', {
-                get: () => undefined
-            });
-        """)
+        context, page = _new_page(browser, storage_state)
 
         logger.info(f"[2/4] Navigating to URL...")
         logger.info(f"      {url[:80]}...")
@@ -224,23 +467,32 @@ def scrape_bmw_inventory(url, max_links=None):
         # Wait for and click the accept cookies button
         logger.info("[3/4] Waiting for cookies popup...")
         try:
-            accept_button = page.get_by_role("button", name="Tout accepter")
-            accept_button.wait_for(state='visible', timeout=BROWSER_TIMEOUT)
+            accept_button = page.get_by_role("button", name=COOKIE_BUTTON_NAME)
+            # With a saved consent the popup usually never shows, so don't wait long for it
+            accept_button.wait_for(state='visible', timeout=2000 if storage_state else BROWSER_TIMEOUT)
             logger.info("      ✓ Cookies popup found, accepting...")
             accept_button.click()
-            # Wait for page to reload/update after accepting cookies
-            page.wait_for_timeout(2000)
-            # Wait for network to be idle again after cookie acceptance
+            # The popup closing marks the click as handled, then let the page settle; the results
+            # waits below cover the rest instead of fixed delays
             try:
+                accept_button.wait_for(state='hidden', timeout=5000)
                 page.wait_for_load_state('networkidle', timeout=10000)
             except Exception:
-                pass  # Continue if networkidle times out
-            page.wait_for_timeout(3000)
+                pass  # Continue if the popup lingers or networkidle times out
             logger.info("      ✓ Cookies accepted, page loaded")
+
+            # Save consent cookies so the next run can skip this step
+            try:
+                os.makedirs(os.path.dirname(BROWSER_STATE_FILE), exist_ok=True)
+                context.storage_state(path=BROWSER_STATE_FILE)
+                logger.info(f"      ✓ Browser state saved: {BROWSER_STATE_FILE}")
+            except Exception as e:
+                logger.warning(f"      ⚠ Could not save browser state: {e}")
         except Exception as e:
-            logger.warning(f"      ⚠ Cookies popup not found or already accepted: {e}")
-            # Wait a bit for page to stabilize
-            page.wait_for_timeout(5000)
+            if storage_state:
+                logger.info("      ✓ No cookies popup (consent restored from saved state)")
+            else:
+                logger.warning(f"      ⚠ Cookies popup not found or already accepted: {e}")
             # Ensure page is fully loaded
             try:
                 page.wait_for_load_state('networkidle', timeout=10000)
@@ -259,10 +511,8 @@ def scrape_bmw_inventory(url, max_links=None):
         except Exception:
             logger.warning("      ⚠ Results container not found, continuing anyway...")
 
-        # Additional wait for JavaScript to render content
-        page.wait_for_timeout(5000)
-
-        # Try to wait for any car listing links to appear using JavaScript
+        # Wait for any car listing links to appear using JavaScript; the show-more loop below then
+        # waits on its own button and card count, so no fixed render delays are needed
         try:
             # Wait for at least one link with "details" in href to appear
             page.wait_for_function(
@@ -289,23 +539,14 @@ def scrape_bmw_inventory(url, max_links=None):
             except Exception:
                 logger.warning("      ⚠ Page content check failed, continuing anyway...")
 
-        # Additional wait after JavaScript detection
-        page.wait_for_timeout(5000)
-
-        # Scroll to trigger lazy loading
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(3000)
-        page.evaluate("window.scrollTo(0, 0)")
-        page.wait_for_timeout(2000)
-
         # Scroll down and click "Montrer plus" button until it's no longer visible
-        show_more_button = page.locator('[data-test="stolo-plp-show-more-button"]')
+        show_more_button = page.locator(SHOW_MORE_SELECTOR)
+        card_count = page.locator(MODEL_CARD_SELECTOR).count()
         click_count = 0
         max_clicks = 50  # Safety limit
 
         while click_count < max_clicks:
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            page.wait_for_timeout(2000)
 
             try:
                 show_more_button.wait_for(state='visible', timeout=5000)
@@ -313,43 +554,32 @@ def scrape_bmw_inventory(url, max_links=None):
                 click_count += 1
                 logger.info(f"      → Clicking 'Montrer plus' button (click #{click_count})...")
                 show_more_button.click()
-                page.wait_for_timeout(4000)  # Increased wait time
-                logger.info(f"      ✓ Content loaded (click #{click_count} completed)")
+
+                # Wait for new cards to render instead of a fixed delay
+                try:
+                    page.wait_for_function(
+                        f"document.querySelectorAll('{MODEL_CARD_SELECTOR}').length > {card_count}",
+                        timeout=5000
+                    )
+                except Exception:
+                    pass
+                new_card_count = page.locator(MODEL_CARD_SELECTOR).count()
+                if new_card_count == card_count and not show_more_button.is_visible():
+                    logger.info(f"      ✓ No new cards after click #{click_count}, stopping")
+                    break
+                card_count = new_card_count
+                logger.info(f"      ✓ Content loaded (click #{click_count} completed, {card_count} cards)")
             except Exception:
                 logger.info(f"      ✓ No more 'Montrer plus' buttons found. Total clicks: {click_count}")
                 break
 
-        # Wait a bit more for any lazy-loaded content
-        page.wait_for_timeout(3000)
-
-        # Final scroll to ensure all content is loaded
-        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        page.wait_for_timeout(2000)
-
         # Extract all model card links
         logger.info("[Extracting links] Finding all car detail links...")
 
-        # Try multiple selectors in case the page structure is different
-        selectors_to_try = [
-            'a.model-card-link',
-            'a[href*="/sl/stocklocator_uc/details"]',
-            'a[href*="stocklocator_uc/details"]',
-            'a[href*="/details"]',
-            '[class*="model-card"] a',
-            '[class*="vehicle-card"] a',
-            '[class*="vehicle"] a[href*="details"]',
-            '[class*="car"] a[href*="details"]',
-            '[class*="listing"] a[href*="details"]',
-            '[class*="result"] a[href*="details"]',
-            'a[href*="stocklocator"][href*="details"]',
-            'a[href*="/fr-be/sl/stocklocator_uc/details"]',
-            'a[href*="bmw.be"][href*="details"]'
-        ]
-
         model_card_links = None
         count = 0
 
-        for selector in selectors_to_try:
+        for selector in CAR_LINK_SELECTORS:
             logger.info(f"      Trying selector: {selector}")
             model_card_links = page.locator(selector)
             count = model_card_links.count()
@@ -493,55 +723,41 @@ def scrape_bmw_inventory(url, max_links=None):
 
         # Extract links using selectors if we didn't find them via JavaScript
         if not links_found_via_js and count > 0 and model_card_links is not None:
-            for i in range(count):
-                try:
-                    href = model_card_links.nth(i).get_attribute('href')
+            # All hrefs in one round-trip instead of one get_attribute call per link
+            try:
+                hrefs = model_card_links.evaluate_all("els => els.map(e => e.getAttribute('href'))")
+                for href in hrefs:
                     if href:
                         if href.startswith('/'):
                             full_url = f"https://www.bmw.be{href}"
                         else:
                             full_url = href
                         links.append(full_url)
-
-                    if (i + 1) % 10 == 0:
-                        logger.info(f"      Processed {i + 1}/{count} links...")
-                except Exception as e:
-                    logger.warning(f"      ⚠ Error extracting link {i+1}: {e}")
-                    continue
+                logger.info(f"      Processed {count}/{count} links...")
+            except Exception as e:
+                logger.warning(f"      ⚠ Error extracting links: {e}")
 
         logger.info("=" * 60)
         logger.info(f"SUMMARY: Found {len(links)} car detail links")
         logger.info("=" * 60)
 
-        # Process car links
-        logger.info("=" * 60)
-        logger.info("PROCESSING CARS...")
-        logger.info("=" * 60)
-
-        test_links = links[:max_links] if max_links else links
-        logger.info(f"Processing {len(test_links)} out of {len(links)} total links")
+        # Consent cookies accepted on the listing page carry over to the detail page browser
+        listing_state = context.storage_state()
 
-        for idx, link in enumerate(test_links, 1):
-            logger.info(f"[{idx}/{len(test_links)}] Processing car {idx}...")
-            logger.info(f"      Link: {link[:80]}...")
+        context.close()
+        browser.close()
 
-            try:
-                car_data = extract_car_data(page, link)
-                all_cars_data.append(car_data)
-                logger.info(f"      ✓ Car {idx} data extracted successfully")
-                if car_data.get('model_name'):
-                    logger.info(f"      → Model: {car_data['model_name']}")
-            except Exception as e:
-                logger.error(f"      ✗ Error processing car {idx}: {str(e)}")
-                error_data = {'link': link, 'error': str(e)}
-                all_cars_data.append(error_data)
+    # Process car links
+    logger.info("=" * 60)
+    logger.info("PROCESSING CARS...")
+    logger.info("=" * 60)
 
-            page.wait_for_timeout(1000)
+    test_links = links[:max_links] if max_links else links
+    logger.info(f"Processing {len(test_links)} out of {len(links)} total links")
 
-        logger.info(f"      ✓ Successfully processed {len(all_cars_data)} cars")
+    all_cars_data = _scrape_with_checkpoint(test_links, listing_state)
 
-        context.close()
-        browser.close()
+    logger.info(f"      ✓ Successfully processed {len(all_cars_data)} cars")
 
     return all_cars_data
 
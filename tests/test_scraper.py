@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from src.bmw.scraper import _AssetCache, _route_request_async
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type='script', method='GET'):
+        self.url = url
+        self.resource_type = resource_type
+        self.method = method
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=b'console.log(1)', headers=None):
+        self.status = status
+        self.headers = headers if headers is not None else {
+            'content-type': 'application/javascript',
+            'content-encoding': 'gzip',
+            'content-length': '34',
+        }
+        self._body = body
+
+    async def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, request, response=None):
+        self.request = request
+        self.response = response or FakeResponse()
+        self.calls = []
+
+    async def fetch(self):
+        self.calls.append(('fetch',))
+        return self.response
+
+    async def fulfill(self, **kwargs):
+        self.calls.append(('fulfill', kwargs))
+
+    async def continue_(self):
+        self.calls.append(('continue',))
+
+    async def abort(self):
+        self.calls.append(('abort',))
+
+
+def route(route, cache):
+    asyncio.run(_route_request_async(route, cache))
+    return route.calls
+
+
+def test_first_request_is_fetched_and_fulfilled_with_the_response():
+    cache = _AssetCache()
+    first = FakeRoute(FakeRequest('https://www.bmw.be/app.js'))
+
+    calls = route(first, cache)
+
+    assert calls == [('fetch',), ('fulfill', {'response': first.response})]
+
+
+def test_repeated_request_is_replayed_without_transfer_headers():
+    cache = _AssetCache()
+    route(FakeRoute(FakeRequest('https://www.bmw.be/app.js')), cache)
+    second = FakeRoute(FakeRequest('https://www.bmw.be/app.js'))
+
+    calls = route(second, cache)
+
+    assert calls == [('fulfill', {
+        'status': 200,
+        'headers': {'content-type': 'application/javascript'},
+        'body': b'console.log(1)',
+    })]
+
+
+def test_error_responses_are_passed_through_and_not_cached():
+    cache = _AssetCache()
+    for _ in range(2):
+        missing = FakeRoute(FakeRequest('https://www.bmw.be/missing.js'), FakeResponse(status=404, body=b''))
+        assert route(missing, cache) == [('fetch',), ('fulfill', {'response': missing.response})]
+    assert cache.get('https://www.bmw.be/missing.js') is None
+
+
+def test_cache_stops_growing_at_max_bytes():
+    cache = _AssetCache(max_bytes=20)
+    route(FakeRoute(FakeRequest('https://www.bmw.be/a.js'), FakeResponse(body=b'x' * 15)), cache)
+    route(FakeRoute(FakeRequest('https://www.bmw.be/b.js'), FakeResponse(body=b'y' * 15)), cache)
+
+    assert cache.get('https://www.bmw.be/a.js') is not None
+    assert cache.get('https://www.bmw.be/b.js') is None
+    assert cache.size == 15
+
+
+def test_blocked_and_uncached_requests_are_not_fetched():
+    cache = _AssetCache()
+    assert route(FakeRoute(FakeRequest('https://www.bmw.be/car.jpg', resource_type='image')), cache) == [('abort',)]
+    assert route(FakeRoute(FakeRequest('https://www.bmw.be/page', resource_type='document')), cache) == [('continue',)]